@@ -4,14 +4,22 @@ Análise de períodos do dia para identificar melhores horários para apostar.
 """
 
 import sqlite3
+from operator import itemgetter
 from pathlib import Path
-from datetime import datetime
 import numpy as np
-from collections import defaultdict
+import pandas as pd
 
 # Configurações
 DB_PATH = Path(__file__).parent.parent.parent / "data" / "crash_stats.db"
 
+# Tipos compactos das colunas lidas do banco
+ROUND_DTYPES = {
+    "multiplier": np.float32,
+    "betCount": np.int32,
+    "totalBet": np.float32,
+    "totalWin": np.float32,
+}
+
 # Definição dos períodos
 PERIODS = {
     "Madrugada (00-06h)": (0, 6),
@@ -32,68 +40,157 @@ DETAILED_PERIODS = {
 }
 
 
+def _connect_readonly():
+    """Abre o banco somente leitura, com mmap, para as varreduras analíticas."""
+    conn = sqlite3.connect(f"{DB_PATH.resolve().as_uri()}?mode=ro", uri=True)
+    conn.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+    conn.execute("PRAGMA cache_size=-65536")    # 64 MiB
+    conn.execute("PRAGMA query_only=1")
+    return conn
+
+
 def load_data():
-    """Carrega dados do banco."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    """
+    Carrega dados do banco em um DataFrame colunar compacto.
+
+    Retorna:
+        DataFrame com as colunas hour (hora local, int8), weekday (int8),
+        multiplier (float32), betCount (int32), totalBet e totalWin (float32).
+    """
+    conn = _connect_readonly()
 
-    cursor.execute("""
+    # Parse ISO vetorizado (linhas com data inválida viram NaT e são descartadas)
+    df = pd.read_sql_query(
+        """
         SELECT createdAt, multiplier, betCount, totalBet, totalWin
         FROM rounds
         ORDER BY createdAt ASC
-    """)
-
-    rows = cursor.fetchall()
+        """,
+        conn,
+        parse_dates={"createdAt": {"format": "ISO8601", "utc": True, "errors": "coerce"}},
+        dtype=ROUND_DTYPES,
+    )
     conn.close()
 
-    data = []
-    for row in rows:
-        created_at = row[0]
-        # Parse ISO format
-        try:
-            dt = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-            # Converter para horário local (assumindo UTC-3 para Brasil)
-            hour = (dt.hour - 3) % 24
-        except:
-            continue
+    df = df[df["createdAt"].notna()].reset_index(drop=True)
+    created_at = df.pop("createdAt").dt
+
+    # Converter para horário local (assumindo UTC-3 para Brasil)
+    df["hour"] = ((created_at.hour - 3) % 24).astype(np.int8)
+    df["weekday"] = created_at.weekday.astype(np.int8)
+
+    return df
 
-        data.append({
-            "datetime": created_at,
-            "hour": hour,
-            "multiplier": row[1],
-            "bet_count": row[2],
-            "total_bet": row[3],
-            "total_win": row[4],
-        })
 
-    return data
+def _bucket_summary(buckets, mults, n_buckets=24):
+    """
+    Agrega os multiplicadores em vetores com uma posição por bucket (hora ou dia).
+
+    Cada contagem é um único np.bincount sobre todas as rodadas, e os
+    multiplicadores são reordenados por bucket para que qualquer intervalo de
+    buckets vire uma fatia contígua (usada para mediana/min/max).
+    """
+    counts = np.bincount(buckets, minlength=n_buckets)
+    mults64 = mults.astype(np.float64)
+    order = np.argsort(buckets, kind="stable")
+
+    return {
+        "count": counts,
+        "offsets": np.concatenate(([0], np.cumsum(counts))),
+        "sorted": mults[order],
+        "sum": np.bincount(buckets, weights=mults64, minlength=n_buckets),
+        "sumsq": np.bincount(buckets, weights=mults64 * mults64, minlength=n_buckets),
+        "gt_1_5x": np.bincount(buckets, weights=mults >= 1.5, minlength=n_buckets),
+        "gt_2x": np.bincount(buckets, weights=mults >= 2.0, minlength=n_buckets),
+        "gt_3x": np.bincount(buckets, weights=mults >= 3.0, minlength=n_buckets),
+        "gt_5x": np.bincount(buckets, weights=mults >= 5.0, minlength=n_buckets),
+        "early_crash": np.bincount(buckets, weights=mults <= 1.2, minlength=n_buckets),
+    }
+
+
+def _summary_stats(summary, start, end):
+    """Calcula as estatísticas para os buckets [start, end) a partir do resumo."""
+    count = int(summary["count"][start:end].sum())
+    if count == 0:
+        return None
+
+    avg = summary["sum"][start:end].sum() / count
+    variance = summary["sumsq"][start:end].sum() / count - avg * avg
+    mults = summary["sorted"][summary["offsets"][start]:summary["offsets"][end]]
+
+    def pct(key):
+        return summary[key][start:end].sum() / count * 100
+
+    return {
+        "count": count,
+        "avg": avg,
+        "median": np.median(mults),
+        "std": np.sqrt(max(variance, 0.0)),
+        "min": mults.min(),
+        "max": mults.max(),
+        "pct_gt_1_5x": pct("gt_1_5x"),
+        "pct_gt_2x": pct("gt_2x"),
+        "pct_gt_3x": pct("gt_3x"),
+        "pct_gt_5x": pct("gt_5x"),
+        "pct_early_crash": pct("early_crash"),
+    }
 
 
 def analyze_by_hour(data):
     """Analisa estatísticas por hora."""
-    by_hour = defaultdict(list)
-
-    for d in data:
-        by_hour[d["hour"]].append(d["multiplier"])
+    summary = _bucket_summary(data["hour"].to_numpy(), data["multiplier"].to_numpy())
 
     results = {}
     for hour in range(24):
-        mults = by_hour.get(hour, [])
-        if not mults:
-            continue
+        stats = _summary_stats(summary, hour, hour + 1)
+        if stats is not None:
+            results[hour] = stats
+
+    return results
+
 
+def load_hourly_stats():
+    """
+    Calcula as estatísticas por hora diretamente no SQLite.
+
+    O GROUP BY devolve só 24 linhas em vez de todas as rodadas. Não inclui
+    mediana; use analyze_by_hour quando ela for necessária.
+    """
+    conn = _connect_readonly()
+
+    rows = conn.execute("""
+        SELECT
+            (CAST(strftime('%H', createdAt) AS INTEGER) + 21) % 24 AS hour,
+            COUNT(*),
+            AVG(multiplier),
+            AVG(multiplier * multiplier),
+            MIN(multiplier),
+            MAX(multiplier),
+            SUM(multiplier >= 1.5),
+            SUM(multiplier >= 2.0),
+            SUM(multiplier >= 3.0),
+            SUM(multiplier >= 5.0),
+            SUM(multiplier <= 1.2)
+        FROM rounds
+        WHERE strftime('%H', createdAt) IS NOT NULL
+        GROUP BY hour
+        ORDER BY hour
+    """).fetchall()
+    conn.close()
+
+    results = {}
+    for hour, count, avg, avg_sq, min_m, max_m, gt_1_5x, gt_2x, gt_3x, gt_5x, early in rows:
         results[hour] = {
-            "count": len(mults),
-            "avg": np.mean(mults),
-            "median": np.median(mults),
-            "std": np.std(mults),
-            "min": np.min(mults),
-            "max": np.max(mults),
-            "pct_gt_1_5x": sum(1 for m in mults if m >= 1.5) / len(mults) * 100,
-            "pct_gt_2x": sum(1 for m in mults if m >= 2.0) / len(mults) * 100,
-            "pct_gt_3x": sum(1 for m in mults if m >= 3.0) / len(mults) * 100,
-            "pct_gt_5x": sum(1 for m in mults if m >= 5.0) / len(mults) * 100,
-            "pct_early_crash": sum(1 for m in mults if m <= 1.2) / len(mults) * 100,
+            "count": count,
+            "avg": avg,
+            "std": np.sqrt(max(avg_sq - avg * avg, 0.0)),
+            "min": min_m,
+            "max": max_m,
+            "pct_gt_1_5x": gt_1_5x / count * 100,
+            "pct_gt_2x": gt_2x / count * 100,
+            "pct_gt_3x": gt_3x / count * 100,
+            "pct_gt_5x": gt_5x / count * 100,
+            "pct_early_crash": early / count * 100,
         }
 
     return results
@@ -101,33 +198,79 @@ def analyze_by_hour(data):
 
 def analyze_by_period(data, periods):
     """Analisa estatísticas por período."""
-    by_period = defaultdict(list)
+    summary = _bucket_summary(data["hour"].to_numpy(), data["multiplier"].to_numpy())
+
+    results = {}
+    for period_name, (start, end) in periods.items():
+        stats = _summary_stats(summary, start, end)
+        if stats is not None:
+            results[period_name] = stats
+
+    return results
 
-    for d in data:
-        hour = d["hour"]
+
+def _wins_per_hour(hours, mults, targets):
+    """
+    Conta, para cada alvo, as rodadas por hora com multiplicador >= alvo.
+
+    Os multiplicadores são ordenados uma única vez dentro de cada hora; cada
+    alvo extra custa apenas uma busca binária por hora.
+
+    Retorna:
+        Matriz int64 (len(targets), 24)
+    """
+    order = np.lexsort((mults, hours))
+    sorted_mults = mults[order]
+    offsets = np.concatenate(([0], np.cumsum(np.bincount(hours, minlength=24))))
+    targets = np.asarray(targets, dtype=mults.dtype)
+
+    wins = np.empty((len(targets), 24), dtype=np.int64)
+    for hour in range(24):
+        segment = sorted_mults[offsets[hour]:offsets[hour + 1]]
+        wins[:, hour] = len(segment) - np.searchsorted(segment, targets, side="left")
+
+    return wins
+
+
+def simulate_targets_by_period(data, periods, targets, bet=2.0):
+    """
+    Simula a estratégia simples para vários alvos de uma vez.
+
+    Retorna:
+        Dict alvo -> resultados por período (mesmo formato de
+        simulate_strategy_by_period)
+    """
+    hours = data["hour"].to_numpy()
+    mults = data["multiplier"].to_numpy()
+
+    # Rodadas e vitórias por hora; cada período é só a soma das suas horas
+    counts_per_hour = np.bincount(hours, minlength=24)
+    wins_per_hour = _wins_per_hour(hours, mults, targets)
+
+    sweep = {}
+    for target, target_wins in zip(targets, wins_per_hour):
+        results = {}
         for period_name, (start, end) in periods.items():
-            if start <= hour < end:
-                by_period[period_name].append(d["multiplier"])
-                break
+            total = int(counts_per_hour[start:end].sum())
+            if total == 0:
+                continue
 
-    results = {}
-    for period_name, mults in by_period.items():
-        if not mults:
-            continue
+            wins = int(target_wins[start:end].sum())
+            losses = total - wins
+            profit = wins * bet * (target - 1) - losses * bet
 
-        results[period_name] = {
-            "count": len(mults),
-            "avg": np.mean(mults),
-            "median": np.median(mults),
-            "std": np.std(mults),
-            "pct_gt_1_5x": sum(1 for m in mults if m >= 1.5) / len(mults) * 100,
-            "pct_gt_2x": sum(1 for m in mults if m >= 2.0) / len(mults) * 100,
-            "pct_gt_3x": sum(1 for m in mults if m >= 3.0) / len(mults) * 100,
-            "pct_gt_5x": sum(1 for m in mults if m >= 5.0) / len(mults) * 100,
-            "pct_early_crash": sum(1 for m in mults if m <= 1.2) / len(mults) * 100,
-        }
+            results[period_name] = {
+                "total_rounds": total,
+                "wins": wins,
+                "losses": losses,
+                "win_rate": wins / total * 100,
+                "profit": profit,
+                "roi": profit / (total * bet) * 100,
+            }
 
-    return results
+        sweep[target] = results
+
+    return sweep
 
 
 def simulate_strategy_by_period(data, periods, target=1.5, bet=2.0):
@@ -135,40 +278,14 @@ def simulate_strategy_by_period(data, periods, target=1.5, bet=2.0):
     Simula uma estratégia simples em cada período.
     Retorna o lucro/prejuízo por período.
     """
-    by_period = defaultdict(list)
+    return simulate_targets_by_period(data, periods, [target], bet)[target]
 
-    for d in data:
-        hour = d["hour"]
-        for period_name, (start, end) in periods.items():
-            if start <= hour < end:
-                by_period[period_name].append(d["multiplier"])
-                break
 
-    results = {}
-    for period_name, mults in by_period.items():
-        wins = 0
-        losses = 0
-        profit = 0
-
-        for m in mults:
-            if m >= target:
-                wins += 1
-                profit += bet * (target - 1)
-            else:
-                losses += 1
-                profit -= bet
-
-        total = wins + losses
-        results[period_name] = {
-            "total_rounds": total,
-            "wins": wins,
-            "losses": losses,
-            "win_rate": wins / total * 100 if total > 0 else 0,
-            "profit": profit,
-            "roi": profit / (total * bet) * 100 if total > 0 else 0,
-        }
-
-    return results
+def _rank_by_roi(results):
+    """Ordena os resultados da simulação por ROI (maior primeiro)."""
+    ranked = [(stats["roi"], period, stats) for period, stats in results.items()]
+    ranked.sort(key=itemgetter(0), reverse=True)
+    return [(period, stats) for _, period, stats in ranked]
 
 
 def print_analysis():
@@ -179,9 +296,10 @@ def print_analysis():
 
     print("\nCarregando dados...")
     data = load_data()
-    print(f"Total de rodadas: {len(data):,}")
+    total_rounds = len(data)
+    print(f"Total de rodadas: {total_rounds:,}")
 
-    if not data:
+    if total_rounds == 0:
         print("Sem dados para analisar!")
         return
 
@@ -195,7 +313,10 @@ def print_analysis():
     print(f"\n{'Período':<25} {'Rounds':>8} {'Média':>8} {'Mediana':>8} {'>1.5x':>8} {'>2x':>8} {'<1.2x':>8}")
     print("-" * 80)
 
-    for period, stats in sorted(period_stats.items(), key=lambda x: PERIODS.get(x[0], (0,0))[0]):
+    for period in PERIODS:
+        stats = period_stats.get(period)
+        if stats is None:
+            continue
         print(f"{period:<25} {stats['count']:>8,} {stats['avg']:>8.2f}x {stats['median']:>8.2f}x "
               f"{stats['pct_gt_1_5x']:>7.1f}% {stats['pct_gt_2x']:>7.1f}% {stats['pct_early_crash']:>7.1f}%")
 
@@ -209,7 +330,10 @@ def print_analysis():
     print(f"\n{'Período':<15} {'Rounds':>8} {'Média':>8} {'>1.5x':>8} {'>2x':>8} {'>3x':>8} {'<1.2x':>8}")
     print("-" * 70)
 
-    for period, stats in sorted(detailed_stats.items(), key=lambda x: DETAILED_PERIODS.get(x[0], (0,0))[0]):
+    for period in DETAILED_PERIODS:
+        stats = detailed_stats.get(period)
+        if stats is None:
+            continue
         print(f"{period:<15} {stats['count']:>8,} {stats['avg']:>8.2f}x "
               f"{stats['pct_gt_1_5x']:>7.1f}% {stats['pct_gt_2x']:>7.1f}% "
               f"{stats['pct_gt_3x']:>7.1f}% {stats['pct_early_crash']:>7.1f}%")
@@ -219,7 +343,7 @@ def print_analysis():
     print("  ESTATÍSTICAS POR HORA")
     print("=" * 80)
 
-    hour_stats = analyze_by_hour(data)
+    hour_stats = load_hourly_stats()
 
     print(f"\n{'Hora':<8} {'Rounds':>8} {'Média':>8} {'>1.5x':>8} {'>2x':>8} {'<1.2x':>8} {'Qualidade':>10}")
     print("-" * 70)
@@ -253,7 +377,7 @@ def print_analysis():
     print(f"\n{'Período':<25} {'Rounds':>8} {'Wins':>8} {'Win%':>8} {'Lucro':>12} {'ROI':>8}")
     print("-" * 75)
 
-    for period, stats in sorted(strategy_results.items(), key=lambda x: x[1]['roi'], reverse=True):
+    for period, stats in _rank_by_roi(strategy_results):
         profit_str = f"R${stats['profit']:+.2f}"
         print(f"{period:<25} {stats['total_rounds']:>8,} {stats['wins']:>8,} "
               f"{stats['win_rate']:>7.1f}% {profit_str:>12} {stats['roi']:>+7.1f}%")
@@ -268,7 +392,7 @@ def print_analysis():
     print(f"\n{'Período':<15} {'Rounds':>8} {'Win%':>8} {'Lucro':>12} {'ROI':>8}")
     print("-" * 55)
 
-    sorted_periods = sorted(detailed_strategy.items(), key=lambda x: x[1]['roi'], reverse=True)
+    sorted_periods = _rank_by_roi(detailed_strategy)
 
     for period, stats in sorted_periods:
         profit_str = f"R${stats['profit']:+.2f}"
@@ -298,34 +422,22 @@ def print_analysis():
     print("  ANÁLISE POR DIA DA SEMANA")
     print("=" * 80)
 
-    by_weekday = defaultdict(list)
     weekday_names = ["Segunda", "Terça", "Quarta", "Quinta", "Sexta", "Sábado", "Domingo"]
-
-    for d in data:
-        try:
-            dt = datetime.fromisoformat(d["datetime"].replace('Z', '+00:00'))
-            weekday = dt.weekday()
-            by_weekday[weekday].append(d["multiplier"])
-        except:
-            continue
+    weekday_summary = _bucket_summary(
+        data["weekday"].to_numpy(), data["multiplier"].to_numpy(), n_buckets=7
+    )
 
     print(f"\n{'Dia':<12} {'Rounds':>8} {'Média':>8} {'>1.5x':>8} {'>2x':>8} {'<1.2x':>8}")
     print("-" * 55)
 
     weekday_results = {}
     for weekday in range(7):
-        mults = by_weekday.get(weekday, [])
-        if not mults:
+        stats = _summary_stats(weekday_summary, weekday, weekday + 1)
+        if stats is None:
             continue
 
-        weekday_results[weekday] = {
-            "name": weekday_names[weekday],
-            "count": len(mults),
-            "avg": np.mean(mults),
-            "pct_gt_1_5x": sum(1 for m in mults if m >= 1.5) / len(mults) * 100,
-            "pct_gt_2x": sum(1 for m in mults if m >= 2.0) / len(mults) * 100,
-            "pct_early_crash": sum(1 for m in mults if m <= 1.2) / len(mults) * 100,
-        }
+        stats["name"] = weekday_names[weekday]
+        weekday_results[weekday] = stats
 
         stats = weekday_results[weekday]
         print(f"{stats['name']:<12} {stats['count']:>8,} {stats['avg']:>8.2f}x "
@@ -351,7 +463,7 @@ def print_analysis():
        - Win Rate: {worst_periods[-1][1]['win_rate']:.1f}%
 
     📊 OBSERVAÇÕES:
-       - Os dados são de um período limitado ({len(data):,} rodadas)
+       - Os dados são de um período limitado ({total_rounds:,} rodadas)
        - Variações podem ocorrer dia a dia
        - Use esses horários como referência, não como garantia
     """)
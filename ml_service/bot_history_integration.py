@@ -18,8 +18,7 @@ Usage:
 import sqlite3
 import logging
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
-from collections import defaultdict
+from typing import Dict, List, Tuple, Optional, Union
 
 import numpy as np
 import pandas as pd
@@ -33,9 +32,60 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Trailing rolling sum over the last `window` rows (min_periods=1).
+
+    Computed from a single prefix sum instead of a pandas rolling object.
+    2D input is treated as one series per row, all handled in the same pass.
+    """
+    cumsum = np.cumsum(values, axis=-1, dtype=np.float64)
+    result = cumsum.copy()
+    result[..., window:] -= cumsum[..., :-window]
+    return result
+
+
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing rolling mean over the last `window` rows (min_periods=1)."""
+    counts = np.minimum(np.arange(1, values.shape[-1] + 1), window)
+    return _rolling_sum(values, window) / counts
+
+
+def _streak_lengths(flags: np.ndarray) -> np.ndarray:
+    """
+    Length of the current run of truthy flags at each row (0 where the flag is off).
+
+    Each row's streak is its distance to the most recent row where the flag
+    was off, found with a running maximum instead of a groupby.
+    """
+    idx = np.arange(len(flags))
+    last_reset = np.maximum.accumulate(np.where(flags, -1, idx))
+    return idx - last_reset
+
+
 class BotHistoryAnalyzer:
     """Analyzes bot betting history from the database."""
 
+    # Cashout buckets: a cashout falls in the first bucket whose upper edge it does not exceed
+    TARGET_LABELS = ['2x', '3x', '5x', '7x', '8x', '10x', '12x', '15x', '20x+']
+    _TARGET_EDGES = np.array([2.5, 3.5, 5.5, 7.5, 8.5, 10.5, 12.5, 15.5], dtype=np.float32)
+    _TARGET_LABEL_ARRAY = np.array(TARGET_LABELS)
+    _TARGET_STATS_DTYPE = [
+        ('count', np.int64),
+        ('wins', np.int64),
+        ('partial_wins', np.int64),
+        ('losses', np.int64),
+        ('total_profit', np.float64),
+    ]
+
+    # Compact dtypes for the bot_bets columns (profit stays float64: it is summed as money)
+    BET_DTYPES = {
+        'cashout2': np.float32,
+        'won1': np.int8,
+        'won2': np.int8,
+    }
+    LOAD_CHUNK_SIZE = 200_000
+
     def __init__(self, db_path: Path = DATABASE_PATH):
         """
         Initialize with database path.
@@ -47,11 +97,28 @@ class BotHistoryAnalyzer:
         self.conn = None
         self.bets_df = None
         self.sessions_df = None
+        self._target_perf = None
 
     def connect(self) -> bool:
-        """Connect to the database."""
+        """
+        Connect to the database.
+
+        The analyzer only reads, so the connection is opened read-only with
+        memory-mapped I/O to speed up the full-table scans.
+        """
+        # A read-only connection cannot create the file, and a missing
+        # database simply means there is no history yet
+        if not Path(self.db_path).exists():
+            logger.warning(f"Database not found at {self.db_path}, no bot history to load")
+            return False
+
         try:
-            self.conn = sqlite3.connect(self.db_path)
+            self.conn = sqlite3.connect(
+                f"{Path(self.db_path).resolve().as_uri()}?mode=ro", uri=True
+            )
+            self.conn.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+            self.conn.execute("PRAGMA cache_size=-65536")    # 64 MiB
+            self.conn.execute("PRAGMA query_only=1")
             logger.info(f"Connected to database: {self.db_path}")
             return True
         except Exception as e:
@@ -66,6 +133,8 @@ class BotHistoryAnalyzer:
 
     def load_bot_history(self) -> bool:
         """Load bot betting history from database."""
+        self._target_perf = None
+
         if not self.conn:
             if not self.connect():
                 return False
@@ -80,17 +149,21 @@ class BotHistoryAnalyzer:
                 logger.warning("bot_bets table does not exist yet")
                 return False
 
-            # Load bets with round data
-            self.bets_df = pd.read_sql_query("""
-                SELECT
-                    bb.*,
-                    r.betCount as round_bet_count,
-                    r.totalBet as round_total_bet,
-                    r.totalWin as round_total_win
-                FROM bot_bets bb
-                LEFT JOIN rounds r ON bb.round_id = r.id
-                ORDER BY bb.timestamp ASC
-            """, self.conn)
+            # Load only the columns the analysis uses, streamed in chunks so
+            # the raw row tuples for a long-running bot never exist all at once
+            chunks = pd.read_sql_query("""
+                SELECT round_id, timestamp, cashout2, won1, won2, profit
+                FROM bot_bets
+                ORDER BY timestamp ASC
+            """, self.conn, dtype=self.BET_DTYPES, chunksize=self.LOAD_CHUNK_SIZE)
+            self.bets_df = pd.concat(list(chunks), ignore_index=True)
+
+            # Outcome flags shared by every analysis, computed once per load
+            won1 = self.bets_df['won1'].to_numpy() == 1
+            won2 = self.bets_df['won2'].to_numpy() == 1
+            self.bets_df['is_full_win'] = won2
+            self.bets_df['is_partial'] = won1 & ~won2
+            self.bets_df['is_loss'] = ~won1
 
             # Load sessions
             cursor.execute(
@@ -117,69 +190,65 @@ class BotHistoryAnalyzer:
         """
         Analyze which target multipliers performed well.
 
+        The result is cached until the history is reloaded, since
+        get_optimal_thresholds and generate_report both depend on it.
+
         Returns:
             Dict with performance metrics per target
         """
+        if self._target_perf is not None:
+            return self._target_perf
+
         if self.bets_df is None or self.bets_df.empty:
             return {}
 
-        target_stats = defaultdict(lambda: {
-            'count': 0,
-            'wins': 0,
-            'losses': 0,
-            'partial_wins': 0,
-            'total_profit': 0,
-            'avg_profit': 0,
-        })
-
-        for _, row in self.bets_df.iterrows():
-            cashout2 = row.get('cashout2', 2)
-            won1 = row.get('won1', 0) == 1
-            won2 = row.get('won2', 0) == 1
-            profit = row.get('profit', 0)
-
-            target_category = self._categorize_target(cashout2)
-
-            target_stats[target_category]['count'] += 1
-            target_stats[target_category]['total_profit'] += profit
-
-            if won1 and won2:
-                target_stats[target_category]['wins'] += 1
-            elif won1:
-                target_stats[target_category]['partial_wins'] += 1
-            else:
-                target_stats[target_category]['losses'] += 1
+        df = self.bets_df
+        n_buckets = len(self.TARGET_LABELS)
+        buckets = np.searchsorted(self._TARGET_EDGES, df['cashout2'].to_numpy())
+        is_loss = df['is_loss'].to_numpy()
+        is_partial = df['is_partial'].to_numpy()
+        is_win = df['is_full_win'].to_numpy() & ~is_loss
+
+        # One row per bucket, filled by bincount over the bucket indices
+        stats = np.zeros(n_buckets, dtype=self._TARGET_STATS_DTYPE)
+        stats['count'] = np.bincount(buckets, minlength=n_buckets)
+        stats['wins'] = np.bincount(buckets[is_win], minlength=n_buckets)
+        stats['partial_wins'] = np.bincount(buckets[is_partial], minlength=n_buckets)
+        stats['losses'] = np.bincount(buckets[is_loss], minlength=n_buckets)
+        stats['total_profit'] = np.bincount(
+            buckets, weights=df['profit'].to_numpy(), minlength=n_buckets
+        )
 
         # Calculate averages and rates
-        for target, stats in target_stats.items():
-            if stats['count'] > 0:
-                stats['avg_profit'] = stats['total_profit'] / stats['count']
-                stats['win_rate'] = stats['wins'] / stats['count'] * 100
-                stats['partial_rate'] = stats['partial_wins'] / stats['count'] * 100
-                stats['success_rate'] = (stats['wins'] + stats['partial_wins']) / stats['count'] * 100
-
-        return dict(target_stats)
-
-    def _categorize_target(self, cashout: float) -> str:
-        """Categorize cashout value into target bucket."""
-        if cashout <= 2.5:
-            return "2x"
-        elif cashout <= 3.5:
-            return "3x"
-        elif cashout <= 5.5:
-            return "5x"
-        elif cashout <= 7.5:
-            return "7x"
-        elif cashout <= 8.5:
-            return "8x"
-        elif cashout <= 10.5:
-            return "10x"
-        elif cashout <= 12.5:
-            return "12x"
-        elif cashout <= 15.5:
-            return "15x"
-        else:
-            return "20x+"
+        self._target_perf = {}
+        for i in np.flatnonzero(stats['count']):
+            count = int(stats['count'][i])
+            wins = int(stats['wins'][i])
+            partial_wins = int(stats['partial_wins'][i])
+            total_profit = float(stats['total_profit'][i])
+
+            self._target_perf[self.TARGET_LABELS[i]] = {
+                'count': count,
+                'wins': wins,
+                'losses': int(stats['losses'][i]),
+                'partial_wins': partial_wins,
+                'total_profit': total_profit,
+                'avg_profit': total_profit / count,
+                'win_rate': wins / count * 100,
+                'partial_rate': partial_wins / count * 100,
+                'success_rate': (wins + partial_wins) / count * 100,
+            }
+
+        return self._target_perf
+
+    def _categorize_target(self, cashout: Union[float, np.ndarray]) -> Union[str, np.ndarray]:
+        """
+        Categorize cashout value(s) into target bucket(s).
+
+        Accepts a scalar or an array; arrays are bucketed in one binary search.
+        """
+        labels = self._TARGET_LABEL_ARRAY[np.searchsorted(self._TARGET_EDGES, cashout)]
+        return labels if np.ndim(labels) else str(labels)
 
     def get_optimal_thresholds(self) -> Dict[str, float]:
         """
@@ -251,41 +320,31 @@ class BotHistoryAnalyzer:
         df = self.bets_df.copy()
 
         # Calculate rolling metrics
-        df['rolling_profit'] = df['profit'].rolling(window=window, min_periods=1).sum()
-        df['rolling_win_rate'] = df['won1'].rolling(window=window, min_periods=1).mean()
-        df['rolling_full_win_rate'] = df['won2'].rolling(window=window, min_periods=1).mean()
+        profit = df['profit'].to_numpy(dtype=np.float64)
+        df['rolling_profit'] = _rolling_sum(profit, window)
+        df['rolling_win_rate'] = _rolling_mean(df['won1'].to_numpy(), window)
+        df['rolling_full_win_rate'] = _rolling_mean(df['won2'].to_numpy(), window)
 
         # Calculate drawdown
-        df['cumulative_profit'] = df['profit'].cumsum()
-        df['peak_profit'] = df['cumulative_profit'].cummax()
+        df['cumulative_profit'] = np.cumsum(profit)
+        df['peak_profit'] = np.maximum.accumulate(df['cumulative_profit'].to_numpy())
         df['drawdown'] = df['peak_profit'] - df['cumulative_profit']
         df['drawdown_pct'] = df['drawdown'] / (df['peak_profit'].abs() + 1) * 100
 
         # Calculate streaks
-        df['is_loss'] = (df['won1'] == 0).astype(int)
-        df['is_win'] = (df['won2'] == 1).astype(int)
-
-        # Loss streak
-        loss_groups = (df['is_loss'] != df['is_loss'].shift()).cumsum()
-        df['loss_streak'] = df.groupby(loss_groups)['is_loss'].cumsum() * df['is_loss']
+        df['loss_streak'] = _streak_lengths(df['is_loss'].to_numpy())
+        df['win_streak'] = _streak_lengths(df['is_full_win'].to_numpy())
 
-        # Win streak
-        win_groups = (df['is_win'] != df['is_win'].shift()).cumsum()
-        df['win_streak'] = df.groupby(win_groups)['is_win'].cumsum() * df['is_win']
+        # Target success indicators, one row per target, rolled together
+        targets = ['5x', '7x', '8x', '10x']
+        thresholds = np.array([float(t.replace('x', '')) for t in targets])[:, None]
+        cashout = df['cashout2'].to_numpy()
+        attempted = (cashout >= thresholds - 0.5) & (cashout <= thresholds + 0.5)
+        success = attempted & df['is_full_win'].to_numpy()
 
-        # Target success indicators
-        for target in ['5x', '7x', '8x', '10x']:
-            threshold = float(target.replace('x', ''))
-            target_col = f'target_{target}_attempted'
-            success_col = f'target_{target}_success'
-
-            df[target_col] = (df['cashout2'] >= threshold - 0.5) & (df['cashout2'] <= threshold + 0.5)
-            df[success_col] = df[target_col] & (df['won2'] == 1)
-
-            # Rolling success rate for this target
-            df[f'rolling_{target}_success'] = (
-                df[success_col].rolling(window=window, min_periods=1).mean()
-            )
+        rolled = _rolling_mean(success, window)
+        for target, rate in zip(targets, rolled):
+            df[f'rolling_{target}_success'] = rate
 
         # Select relevant features
         feature_cols = [
@@ -296,7 +355,7 @@ class BotHistoryAnalyzer:
             'drawdown_pct',
             'loss_streak',
             'win_streak',
-        ] + [f'rolling_{t}_success' for t in ['5x', '7x', '8x', '10x']]
+        ] + [f'rolling_{t}_success' for t in targets]
 
         return df[feature_cols].copy()
 
@@ -306,9 +365,9 @@ class BotHistoryAnalyzer:
             return "No bot betting data available in database."
 
         total_bets = len(self.bets_df)
-        wins = (self.bets_df['won2'] == 1).sum()
-        partials = ((self.bets_df['won1'] == 1) & (self.bets_df['won2'] == 0)).sum()
-        losses = (self.bets_df['won1'] == 0).sum()
+        wins = np.count_nonzero(self.bets_df['is_full_win'].to_numpy())
+        partials = np.count_nonzero(self.bets_df['is_partial'].to_numpy())
+        losses = np.count_nonzero(self.bets_df['is_loss'].to_numpy())
         total_profit = self.bets_df['profit'].sum()
         avg_profit = self.bets_df['profit'].mean()
 
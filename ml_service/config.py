@@ -45,6 +45,9 @@ REDIS_PASSWORD = os.getenv("REDIS_PASSWORD", None)
 # Channel for publishing predictions
 REDIS_CHANNEL_PREDICTIONS = "ml_predictions"
 
+# Channel where the observer announces each inserted round (payload: round id)
+REDIS_CHANNEL_NEW_ROUNDS = "new_rounds"
+
 # =============================================================================
 # MODEL CONFIGURATION
 # =============================================================================
@@ -64,6 +67,7 @@ MODEL_FILES = {
     "early_crash": "model_early_crash.joblib",
     "high_loss_streak": "model_high_loss_streak.joblib",
     "scaler": "feature_scaler.joblib",
+    "bin_edges": "feature_bin_edges.joblib",
 }
 
 # =============================================================================
@@ -100,6 +104,23 @@ TEST_RATIO = 0.15
 # Minimum rounds needed for training
 MIN_ROUNDS_FOR_TRAINING = 1000
 
+# Compact dtypes applied to the rounds table as it is loaded
+ROUND_DTYPES = {
+    "multiplier": "float32",
+    "betCount": "int32",
+    "totalBet": "float32",
+    "totalWin": "float32",
+}
+
+# Quantile bins per feature; features are stored as uint8 bin indices for training
+FEATURE_BINS = 256
+
+# Processes used to train the per-label models in parallel (1 = sequential)
+TRAINING_WORKERS = int(os.getenv("TRAINING_WORKERS", os.cpu_count() or 1))
+
+# Device used by XGBoost: "cpu" or "cuda" (GPU training needs a CUDA-enabled build)
+XGBOOST_DEVICE = os.getenv("XGBOOST_DEVICE", "cpu")
+
 # XGBoost parameters (tuned for imbalanced classification and stability)
 XGBOOST_PARAMS = {
     "n_estimators": 300,           # Mais árvores para melhor generalização
@@ -113,8 +134,8 @@ XGBOOST_PARAMS = {
     "reg_alpha": 0.5,              # L1 regularização
     "reg_lambda": 2.0,             # L2 regularização mais forte
     "random_state": 42,
-    "n_jobs": -1,
-    "use_label_encoder": False,
+    "tree_method": "hist",         # Histogramas, igual em CPU e GPU
+    "device": XGBOOST_DEVICE,
     "eval_metric": "auc",          # AUC é melhor para classificação binária desbalanceada
     "early_stopping_rounds": 30,   # Early stopping para evitar overfitting
 }
@@ -137,9 +158,17 @@ USE_CLASS_WEIGHTS = True
 # INFERENCE SERVICE SETTINGS
 # =============================================================================
 
-# Polling interval for new rounds (seconds)
+# Polling interval for new rounds when Redis is unavailable (seconds)
 POLLING_INTERVAL = 2.0
 
+# With Redis, the database is still checked this often in case a
+# notification is missed (seconds)
+WATCHDOG_INTERVAL = 30.0
+
+# How long a cached "no subscribers" answer is trusted before asking Redis
+# again; predictions are not encoded or published meanwhile (seconds)
+SUBSCRIBER_CHECK_INTERVAL = 5.0
+
 # Minimum rounds needed before making predictions
 MIN_ROUNDS_FOR_PREDICTION = 100
 
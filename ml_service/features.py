@@ -17,10 +17,14 @@ Feature Categories:
 7. Sequence features (last N multipliers as individual features)
 """
 
+import math
+from bisect import bisect_left, insort
+from collections import deque
+
 import numpy as np
 import pandas as pd
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 import logging
 
 from config import (
@@ -30,10 +34,58 @@ from config import (
     EARLY_CRASH_THRESHOLD,
     HIGH_LOSS_STREAK_WINDOW,
     HIGH_LOSS_STREAK_THRESHOLD_FACTOR,
+    ROUND_DTYPES,
 )
 
 logger = logging.getLogger(__name__)
 
+# Cyclical encodings for every hour, weekday and minute of the day
+_HOUR_SIN = np.sin(2 * np.pi * np.arange(24) / 24)
+_HOUR_COS = np.cos(2 * np.pi * np.arange(24) / 24)
+_DAY_SIN = np.sin(2 * np.pi * np.arange(7) / 7)
+_DAY_COS = np.cos(2 * np.pi * np.arange(7) / 7)
+_MINUTE_SIN = np.sin(2 * np.pi * np.arange(1440) / 1440)
+_MINUTE_COS = np.cos(2 * np.pi * np.arange(1440) / 1440)
+
+# Windows and thresholds of the event features, shared by every feature path
+_COUNT_WINDOWS = (50, 100)
+_SINCE_THRESHOLDS = (2.0, 5.0, 10.0)
+_EARLY_CRASH_WINDOWS = (20, 50)
+_TREND_WINDOW = 20
+_VOLATILITY_RECENT_WINDOW = 20
+_VOLATILITY_HISTORICAL_WINDOW = 100
+
+# Scalar type multipliers are stored in (float32); NumPy compares them with
+# the thresholds in this precision
+_MULTIPLIER_TYPE = np.dtype(ROUND_DTYPES["multiplier"]).type
+
+
+def _prefix_sum(values: np.ndarray, dtype=np.float64) -> np.ndarray:
+    """Prefix sum with a leading zero, so sum(values[a:b]) == out[b] - out[a]."""
+    return np.concatenate(([0], np.cumsum(values, dtype=dtype)))
+
+
+def _window_mean_std(
+    sums: np.ndarray,
+    squares: np.ndarray,
+    idx: np.ndarray,
+    window: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mean and population std of the last `window` values before each index.
+
+    Takes the prefix sums of the values and of their squares; the std is 0
+    for windows with fewer than two values.
+    """
+    start = np.maximum(idx - window, 0)
+    count = idx - start
+
+    mean = (sums[idx] - sums[start]) / count
+    variance = (squares[idx] - squares[start]) / count - mean * mean
+    std = np.where(count > 1, np.sqrt(np.maximum(variance, 0.0)), 0.0)
+
+    return mean, std
+
 
 class FeatureEngineer:
     """
@@ -46,13 +98,20 @@ class FeatureEngineer:
     def __init__(self):
         """Initialize the feature engineer."""
         self.feature_names: List[str] = []
+        self.feature_index: Dict[str, int] = {}
         self._build_feature_names()
 
     def _build_feature_names(self) -> None:
-        """Build the list of feature names for reference."""
+        """
+        Build the list of feature names for reference.
+
+        Also records where each block of features starts, so the per-round
+        path writes by integer offset; the names are only metadata.
+        """
         names = []
 
         # Time features
+        self._time_offset = len(names)
         names.extend(["hour_of_day", "day_of_week", "minute_of_day"])
 
         # Cyclical time features (sin/cos encoding)
@@ -63,7 +122,9 @@ class FeatureEngineer:
         ])
 
         # Rolling statistics for each window size
+        self._rolling_offsets: Dict[int, int] = {}
         for window in WINDOW_SIZES:
+            self._rolling_offsets[window] = len(names)
             names.extend([
                 f"multiplier_mean_{window}",
                 f"multiplier_std_{window}",
@@ -77,23 +138,28 @@ class FeatureEngineer:
             ])
 
         # Event counts for each threshold and window
+        self._count_offset = len(names)
         for threshold in MULTIPLIER_THRESHOLDS:
-            for window in [50, 100]:
+            for window in _COUNT_WINDOWS:
                 names.append(f"count_gt_{threshold}x_last_{window}")
 
         # Distance since last event
-        for threshold in [2.0, 5.0, 10.0]:
+        self._since_offset = len(names)
+        for threshold in _SINCE_THRESHOLDS:
             names.append(f"rounds_since_gt_{threshold}x")
 
         # Early crash rate in windows
-        for window in [20, 50]:
+        self._early_crash_offset = len(names)
+        for window in _EARLY_CRASH_WINDOWS:
             names.append(f"early_crash_rate_{window}")
 
         # Sequence features (last N multipliers)
+        self._lag_offset = len(names)
         for i in range(1, SEQUENCE_LENGTH + 1):
             names.append(f"multiplier_lag_{i}")
 
         # Derived features
+        self._derived_offset = len(names)
         names.extend([
             "multiplier_trend_20",  # Linear trend of last 20 multipliers
             "volatility_ratio",     # Recent volatility vs historical
@@ -101,38 +167,36 @@ class FeatureEngineer:
         ])
 
         self.feature_names = names
+        self.feature_index = {name: i for i, name in enumerate(names)}
 
-    def extract_time_features(self, timestamp: datetime) -> Dict[str, float]:
+    def extract_time_features(self, timestamp: datetime, out: np.ndarray) -> None:
         """
-        Extract time-based features from timestamp.
+        Write time-based features from timestamp into a feature row.
 
         Uses cyclical encoding (sin/cos) to preserve the circular nature
         of time (e.g., hour 23 is close to hour 0).
 
         Args:
             timestamp: The datetime of the round
-
-        Returns:
-            Dictionary of time features
+            out: Feature row (feature_names order) to write into
         """
         hour = timestamp.hour
         day = timestamp.weekday()  # 0=Monday, 6=Sunday
         minute = timestamp.hour * 60 + timestamp.minute
 
-        features = {
-            "hour_of_day": hour,
-            "day_of_week": day,
-            "minute_of_day": minute,
-            # Cyclical encoding
-            "hour_sin": np.sin(2 * np.pi * hour / 24),
-            "hour_cos": np.cos(2 * np.pi * hour / 24),
-            "day_sin": np.sin(2 * np.pi * day / 7),
-            "day_cos": np.cos(2 * np.pi * day / 7),
-            "minute_sin": np.sin(2 * np.pi * minute / 1440),
-            "minute_cos": np.cos(2 * np.pi * minute / 1440),
-        }
-
-        return features
+        offset = self._time_offset
+        out[offset:offset + 9] = (
+            hour,
+            day,
+            minute,
+            # Cyclical encoding (precomputed tables)
+            _HOUR_SIN[hour],
+            _HOUR_COS[hour],
+            _DAY_SIN[day],
+            _DAY_COS[day],
+            _MINUTE_SIN[minute],
+            _MINUTE_COS[minute],
+        )
 
     def compute_rolling_stats(
         self,
@@ -140,10 +204,11 @@ class FeatureEngineer:
         bet_counts: np.ndarray,
         total_bets: np.ndarray,
         total_wins: np.ndarray,
-        window: int
-    ) -> Dict[str, float]:
+        window: int,
+        out: np.ndarray
+    ) -> None:
         """
-        Compute rolling window statistics.
+        Write rolling window statistics into a feature row.
 
         Uses the last 'window' values (excluding current) to compute stats.
 
@@ -153,9 +218,7 @@ class FeatureEngineer:
             total_bets: Array of total bet amounts
             total_wins: Array of total win amounts
             window: Window size for rolling stats
-
-        Returns:
-            Dictionary of rolling statistics
+            out: Feature row (feature_names order) to write into
         """
         # Ensure we have enough data
         if len(multipliers) < window:
@@ -168,21 +231,23 @@ class FeatureEngineer:
         bets = bet_counts[-actual_window:]
         tbets = total_bets[-actual_window:]
         twins = total_wins[-actual_window:]
-        house_profit = tbets - twins
-
-        features = {
-            f"multiplier_mean_{window}": np.mean(mult) if len(mult) > 0 else 0,
-            f"multiplier_std_{window}": np.std(mult) if len(mult) > 1 else 0,
-            f"multiplier_min_{window}": np.min(mult) if len(mult) > 0 else 0,
-            f"multiplier_max_{window}": np.max(mult) if len(mult) > 0 else 0,
-            f"multiplier_median_{window}": np.median(mult) if len(mult) > 0 else 0,
-            f"bet_count_mean_{window}": np.mean(bets) if len(bets) > 0 else 0,
-            f"total_bet_mean_{window}": np.mean(tbets) if len(tbets) > 0 else 0,
-            f"total_win_mean_{window}": np.mean(twins) if len(twins) > 0 else 0,
-            f"house_profit_mean_{window}": np.mean(house_profit) if len(house_profit) > 0 else 0,
-        }
 
-        return features
+        total_bet_mean = np.mean(tbets) if len(tbets) > 0 else 0
+        total_win_mean = np.mean(twins) if len(twins) > 0 else 0
+
+        offset = self._rolling_offsets[window]
+        out[offset:offset + 9] = (
+            np.mean(mult) if len(mult) > 0 else 0,
+            np.std(mult) if len(mult) > 1 else 0,
+            np.min(mult) if len(mult) > 0 else 0,
+            np.max(mult) if len(mult) > 0 else 0,
+            np.median(mult) if len(mult) > 0 else 0,
+            np.mean(bets) if len(bets) > 0 else 0,
+            total_bet_mean,
+            total_win_mean,
+            # The mean is linear: mean(bets - wins) == mean(bets) - mean(wins)
+            total_bet_mean - total_win_mean,
+        )
 
     def count_events_above_threshold(
         self,
@@ -227,12 +292,12 @@ class FeatureEngineer:
         """
         lookback = min(len(multipliers), max_lookback)
 
-        for i in range(lookback):
-            idx = len(multipliers) - 1 - i
-            if multipliers[idx] > threshold:
-                return i
+        # Most recent round first; argmax finds the first hit
+        hits = multipliers[len(multipliers) - lookback:][::-1] > threshold
+        if not hits.any():
+            return lookback
 
-        return lookback
+        return int(np.argmax(hits))
 
     def compute_early_crash_rate(
         self,
@@ -265,7 +330,7 @@ class FeatureEngineer:
     def compute_multiplier_trend(
         self,
         multipliers: np.ndarray,
-        window: int = 20
+        window: int = _TREND_WINDOW
     ) -> float:
         """
         Compute linear trend of multipliers over a window.
@@ -288,20 +353,17 @@ class FeatureEngineer:
         else:
             data = multipliers[-window:]
 
-        x = np.arange(len(data))
-
         # Simple linear regression slope
-        if len(data) < 2:
+        n = len(data)
+        if n < 2:
             return 0.0
 
-        x_mean = np.mean(x)
         y_mean = np.mean(data)
 
-        numerator = np.sum((x - x_mean) * (data - y_mean))
-        denominator = np.sum((x - x_mean) ** 2)
-
-        if denominator == 0:
-            return 0.0
+        # x = 0..n-1, so sum((x - x_mean) ** 2) is n(n^2 - 1)/12 and the
+        # numerator only needs sum(x * y)
+        numerator = np.dot(np.arange(n), data) - (n - 1) / 2 * np.sum(data)
+        denominator = n * (n * n - 1) / 12
 
         slope = numerator / denominator
 
@@ -311,34 +373,28 @@ class FeatureEngineer:
     def compute_sequence_features(
         self,
         multipliers: np.ndarray,
+        out: np.ndarray,
         length: int = SEQUENCE_LENGTH
-    ) -> Dict[str, float]:
+    ) -> None:
         """
-        Extract the last N multipliers as individual features.
+        Write the last N multipliers into a feature row as individual features.
 
         Args:
             multipliers: Array of multiplier values
+            out: Feature row (feature_names order) to write into
             length: Number of lags to extract
-
-        Returns:
-            Dictionary with lag features
         """
-        features = {}
-
-        for i in range(1, length + 1):
-            idx = len(multipliers) - i
-            if idx >= 0:
-                features[f"multiplier_lag_{i}"] = multipliers[idx]
-            else:
-                features[f"multiplier_lag_{i}"] = 0.0  # Padding for missing data
-
-        return features
+        # Most recent first, padded with zeros for missing data
+        recent = multipliers[::-1][:length]
+        offset = self._lag_offset
+        out[offset:offset + len(recent)] = recent
+        out[offset + len(recent):offset + length] = 0.0
 
     def compute_volatility_ratio(
         self,
         multipliers: np.ndarray,
-        recent_window: int = 20,
-        historical_window: int = 100
+        recent_window: int = _VOLATILITY_RECENT_WINDOW,
+        historical_window: int = _VOLATILITY_HISTORICAL_WINDOW
     ) -> float:
         """
         Compute ratio of recent volatility to historical volatility.
@@ -372,8 +428,8 @@ class FeatureEngineer:
     def compute_hot_streak_indicator(
         self,
         multipliers: np.ndarray,
-        recent_window: int = 20,
-        historical_window: int = 100
+        recent_window: int = _VOLATILITY_RECENT_WINDOW,
+        historical_window: int = _VOLATILITY_HISTORICAL_WINDOW
     ) -> float:
         """
         Compute indicator of whether recent performance is above average.
@@ -404,11 +460,78 @@ class FeatureEngineer:
 
         return (recent_mean - historical_mean) / historical_mean
 
+    def extract_features_row(
+        self,
+        multipliers: np.ndarray,
+        bet_counts: np.ndarray,
+        total_bets: np.ndarray,
+        total_wins: np.ndarray,
+        timestamp: datetime,
+        out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Compute all features for the round that follows a history of rounds.
+
+        Args:
+            multipliers: Multipliers of the past rounds (chronological order)
+            bet_counts: Player counts of the past rounds
+            total_bets: Total bet amounts of the past rounds
+            total_wins: Total win amounts of the past rounds
+            timestamp: Time of the round being predicted
+            out: Optional preallocated row to write into
+
+        Returns:
+            Float32 feature row in feature_names order
+        """
+        if out is None:
+            out = np.zeros(len(self.feature_names), dtype=np.float32)
+
+        # 1. Time features
+        self.extract_time_features(timestamp, out)
+
+        # 2. Rolling statistics for each window size
+        for window in WINDOW_SIZES:
+            self.compute_rolling_stats(
+                multipliers, bet_counts, total_bets, total_wins, window, out
+            )
+
+        # 3. Event counts
+        offset = self._count_offset
+        for threshold in MULTIPLIER_THRESHOLDS:
+            for window in _COUNT_WINDOWS:
+                out[offset] = self.count_events_above_threshold(
+                    multipliers, threshold, window
+                )
+                offset += 1
+
+        # 4. Distance since last event
+        offset = self._since_offset
+        for i, threshold in enumerate(_SINCE_THRESHOLDS):
+            out[offset + i] = self.rounds_since_event(multipliers, threshold)
+
+        # 5. Early crash rate
+        offset = self._early_crash_offset
+        for i, window in enumerate(_EARLY_CRASH_WINDOWS):
+            out[offset + i] = self.compute_early_crash_rate(multipliers, window)
+
+        # 6. Sequence features (last N multipliers)
+        self.compute_sequence_features(multipliers, out)
+
+        # 7. Derived features
+        offset = self._derived_offset
+        out[offset:offset + 3] = (
+            self.compute_multiplier_trend(multipliers),
+            self.compute_volatility_ratio(multipliers),
+            self.compute_hot_streak_indicator(multipliers),
+        )
+
+        return out
+
     def extract_features_for_round(
         self,
         round_idx: int,
         df: pd.DataFrame
-    ) -> Optional[Dict[str, float]]:
+    ) -> Optional[np.ndarray]:
         """
         Extract all features for predicting a specific round.
 
@@ -420,66 +543,297 @@ class FeatureEngineer:
             df: DataFrame with all rounds (sorted by time ascending)
 
         Returns:
-            Dictionary of features, or None if insufficient data
+            Float32 feature row (feature_names order), or None if insufficient data
         """
-        # Get all data BEFORE this round (strictly temporal)
-        if round_idx < 1:
-            return None
-
-        history = df.iloc[:round_idx]
-
-        if len(history) < 10:  # Minimum data requirement
+        if round_idx < 10:  # Minimum data requirement
             return None
 
-        # Extract arrays for efficiency
-        multipliers = history["multiplier"].values
-        bet_counts = history["betCount"].values
-        total_bets = history["totalBet"].values
-        total_wins = history["totalWin"].values
-
         # Get timestamp for time features
-        current_row = df.iloc[round_idx]
         try:
-            timestamp = pd.to_datetime(current_row["createdAt"])
+            timestamp = pd.to_datetime(df["createdAt"].values[round_idx])
         except:
             timestamp = datetime.now()
 
-        features = {}
+        # Get all data BEFORE this round (strictly temporal), sliced
+        # straight from the column arrays
+        return self.extract_features_row(
+            df["multiplier"].values[:round_idx],
+            df["betCount"].values[:round_idx],
+            df["totalBet"].values[:round_idx],
+            df["totalWin"].values[:round_idx],
+            timestamp,
+        )
+
+    def _batch_time_features(
+        self,
+        df: pd.DataFrame,
+        indices: List[int]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Compute the time features for many rounds at once.
 
-        # 1. Time features
-        features.update(self.extract_time_features(timestamp))
+        The createdAt column is parsed in a single call and the cyclical
+        encodings are evaluated on whole arrays. Timestamps that cannot be
+        parsed fall back to the current time, as in extract_features_for_round.
 
-        # 2. Rolling statistics for each window size
+        Args:
+            df: DataFrame with rounds (sorted by time ascending)
+            indices: Round indices to return rows for
+
+        Returns:
+            Dictionary mapping feature names to arrays aligned with indices
+        """
+        timestamps = pd.to_datetime(
+            df["createdAt"].iloc[indices], format="ISO8601", utc=True, errors="coerce"
+        )
+        if timestamps.isna().any():
+            timestamps = timestamps.fillna(pd.Timestamp(datetime.now(), tz="UTC"))
+
+        hour = timestamps.dt.hour.to_numpy()
+        day = timestamps.dt.dayofweek.to_numpy()  # 0=Monday, 6=Sunday
+        minute = hour * 60 + timestamps.dt.minute.to_numpy()
+
+        return {
+            "hour_of_day": hour,
+            "day_of_week": day,
+            "minute_of_day": minute,
+            # Cyclical encoding (precomputed tables)
+            "hour_sin": _HOUR_SIN[hour],
+            "hour_cos": _HOUR_COS[hour],
+            "day_sin": _DAY_SIN[day],
+            "day_cos": _DAY_COS[day],
+            "minute_sin": _MINUTE_SIN[minute],
+            "minute_cos": _MINUTE_COS[minute],
+        }
+
+    def _batch_rolling_stats(
+        self,
+        df: pd.DataFrame,
+        indices: List[int]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Compute the rolling window statistics for many rounds at once.
+
+        Means and standard deviations come from prefix sums shared by all
+        window sizes; min, max and median use pandas rolling windows shifted
+        by one row. Round i only sees rounds before it, so the values match
+        compute_rolling_stats applied to the history of each round.
+
+        Args:
+            df: DataFrame with rounds (sorted by time ascending)
+            indices: Round indices to return rows for
+
+        Returns:
+            Dictionary mapping feature names to arrays aligned with indices
+        """
+        idx = np.asarray(indices)
+
+        # Centering keeps the sum of squares well conditioned for the variance
+        multipliers = df["multiplier"].to_numpy(dtype=np.float64)
+        offset = multipliers.mean()
+        centered = multipliers - offset
+        mult_sums = _prefix_sum(centered)
+        mult_squares = _prefix_sum(centered * centered)
+
+        bet_sums = _prefix_sum(df["betCount"].to_numpy())
+        total_bet_sums = _prefix_sum(df["totalBet"].to_numpy())
+        total_win_sums = _prefix_sum(df["totalWin"].to_numpy())
+
+        past = df["multiplier"].astype(float).shift(1)
+
+        features = {}
         for window in WINDOW_SIZES:
-            features.update(self.compute_rolling_stats(
-                multipliers, bet_counts, total_bets, total_wins, window
-            ))
+            start = np.maximum(idx - window, 0)
+            count = idx - start
+
+            mean, std = _window_mean_std(mult_sums, mult_squares, idx, window)
+            rolling = past.rolling(window, min_periods=1)
+
+            features[f"multiplier_mean_{window}"] = mean + offset
+            features[f"multiplier_std_{window}"] = std
+            features[f"multiplier_min_{window}"] = rolling.min().to_numpy()[idx]
+            features[f"multiplier_max_{window}"] = rolling.max().to_numpy()[idx]
+            features[f"multiplier_median_{window}"] = rolling.median().to_numpy()[idx]
+            features[f"bet_count_mean_{window}"] = (bet_sums[idx] - bet_sums[start]) / count
+            total_bet_mean = (total_bet_sums[idx] - total_bet_sums[start]) / count
+            total_win_mean = (total_win_sums[idx] - total_win_sums[start]) / count
+            features[f"total_bet_mean_{window}"] = total_bet_mean
+            features[f"total_win_mean_{window}"] = total_win_mean
+            features[f"house_profit_mean_{window}"] = total_bet_mean - total_win_mean
+
+        return features
+
+    def _batch_rounds_since(
+        self,
+        multipliers: np.ndarray,
+        indices: List[int],
+        max_lookback: int = 200
+    ) -> Dict[str, np.ndarray]:
+        """
+        Compute the rounds-since-event features for many rounds at once.
+
+        A running maximum of hit positions gives the last hit before each
+        round, so the distance is a subtraction (same values as
+        rounds_since_event applied to the history of each round).
+
+        Args:
+            multipliers: Array of multiplier values (chronological order)
+            indices: Round indices to return rows for
+            max_lookback: Maximum rounds to look back
+
+        Returns:
+            Dictionary mapping feature names to arrays aligned with indices
+        """
+        positions = np.arange(len(multipliers))
+        previous = np.asarray(indices) - 1
+
+        features = {}
+        for threshold in _SINCE_THRESHOLDS:
+            last_hit = np.maximum.accumulate(
+                np.where(multipliers > threshold, positions, -1)
+            )
+            features[f"rounds_since_gt_{threshold}x"] = np.minimum(
+                previous - last_hit[previous], max_lookback
+            )
+
+        return features
+
+    def _batch_event_counts(
+        self,
+        multipliers: np.ndarray,
+        indices: List[int]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Compute the event count and early crash rate features for many rounds.
+
+        One prefix sum per threshold turns every window count into a
+        subtraction (same values as count_events_above_threshold and
+        compute_early_crash_rate applied to the history of each round).
+
+        Args:
+            multipliers: Array of multiplier values (chronological order)
+            indices: Round indices to return rows for
+
+        Returns:
+            Dictionary mapping feature names to arrays aligned with indices
+        """
+        idx = np.asarray(indices)
+        features = {}
 
-        # 3. Event counts
         for threshold in MULTIPLIER_THRESHOLDS:
-            for window in [50, 100]:
-                key = f"count_gt_{threshold}x_last_{window}"
-                features[key] = self.count_events_above_threshold(
-                    multipliers, threshold, window
-                )
+            hits = _prefix_sum(multipliers > threshold, np.int32)
+            for window in _COUNT_WINDOWS:
+                start = np.maximum(idx - window, 0)
+                features[f"count_gt_{threshold}x_last_{window}"] = hits[idx] - hits[start]
+
+        early_crashes = _prefix_sum(multipliers <= EARLY_CRASH_THRESHOLD, np.int32)
+        for window in _EARLY_CRASH_WINDOWS:
+            start = np.maximum(idx - window, 0)
+            features[f"early_crash_rate_{window}"] = (
+                (early_crashes[idx] - early_crashes[start]) / (idx - start)
+            )
 
-        # 4. Distance since last event
-        for threshold in [2.0, 5.0, 10.0]:
-            key = f"rounds_since_gt_{threshold}x"
-            features[key] = self.rounds_since_event(multipliers, threshold)
+        return features
 
-        # 5. Early crash rate
-        for window in [20, 50]:
-            key = f"early_crash_rate_{window}"
-            features[key] = self.compute_early_crash_rate(multipliers, window)
+    def _batch_multiplier_trend(
+        self,
+        multipliers: np.ndarray,
+        indices: List[int],
+        window: int = _TREND_WINDOW
+    ) -> np.ndarray:
+        """
+        Compute the multiplier trend feature for many rounds at once.
 
-        # 6. Sequence features (last N multipliers)
-        features.update(self.compute_sequence_features(multipliers))
+        Prefix sums of y and position * y give every window's regression
+        numerator in constant time (same values as compute_multiplier_trend
+        applied to the history of each round).
 
-        # 7. Derived features
-        features["multiplier_trend_20"] = self.compute_multiplier_trend(multipliers, 20)
-        features["volatility_ratio"] = self.compute_volatility_ratio(multipliers)
-        features["hot_streak_indicator"] = self.compute_hot_streak_indicator(multipliers)
+        Args:
+            multipliers: Array of multiplier values (chronological order)
+            indices: Round indices to return rows for
+            window: Window size for trend computation
+
+        Returns:
+            Array of normalized slopes aligned with indices
+        """
+        idx = np.asarray(indices)
+        start = np.maximum(idx - window, 0)
+        n = idx - start
+
+        # The slope does not depend on a shift of y; centering keeps the sums small
+        values = multipliers.astype(np.float64)
+        offset = values.mean()
+        centered = values - offset
+        sums = _prefix_sum(centered)
+        weighted_sums = _prefix_sum(np.arange(len(values)) * centered)
+
+        y_sum = sums[idx] - sums[start]
+        # sum(x * y) with x counted from the start of each window
+        xy_sum = weighted_sums[idx] - weighted_sums[start] - start * y_sum
+
+        numerator = xy_sum - (n - 1) / 2 * y_sum
+        denominator = np.maximum(n * (n * n - 1) / 12, 1)
+        y_mean = y_sum / np.maximum(n, 1) + offset
+
+        return np.where(n >= 2, numerator / denominator / (y_mean + 1e-6), 0.0)
+
+    def _batch_sequence_and_ratios(
+        self,
+        multipliers: np.ndarray,
+        indices: List[int],
+        recent_window: int = _VOLATILITY_RECENT_WINDOW,
+        historical_window: int = _VOLATILITY_HISTORICAL_WINDOW
+    ) -> Dict[str, np.ndarray]:
+        """
+        Compute the lag, volatility ratio and hot streak features for many rounds.
+
+        Lags are gathered with one fancy index per lag and the recent vs
+        historical means/stds come from prefix sums (same values as
+        compute_sequence_features, compute_volatility_ratio and
+        compute_hot_streak_indicator applied to the history of each round).
+
+        Args:
+            multipliers: Array of multiplier values (chronological order)
+            indices: Round indices to return rows for
+            recent_window: Window for recent mean/volatility
+            historical_window: Window for historical mean/volatility
+
+        Returns:
+            Dictionary mapping feature names to arrays aligned with indices
+        """
+        idx = np.asarray(indices)
+        features = {}
+
+        for i in range(1, SEQUENCE_LENGTH + 1):
+            source = idx - i
+            # Padding for missing data
+            features[f"multiplier_lag_{i}"] = np.where(
+                source >= 0, multipliers[np.maximum(source, 0)], 0.0
+            )
+
+        values = multipliers.astype(np.float64)
+        offset = values.mean()
+        centered = values - offset
+        sums = _prefix_sum(centered)
+        squares = _prefix_sum(centered * centered)
+
+        recent_mean, recent_std = _window_mean_std(sums, squares, idx, recent_window)
+        historical_mean, historical_std = _window_mean_std(sums, squares, idx, historical_window)
+        recent_mean += offset
+        historical_mean += offset
+
+        enough_history = idx >= recent_window
+        volatile = enough_history & (historical_std >= 1e-6)
+        features["volatility_ratio"] = np.where(
+            volatile, recent_std / np.where(volatile, historical_std, 1.0), 1.0
+        )
+
+        trending = enough_history & (historical_mean >= 1e-6)
+        features["hot_streak_indicator"] = np.where(
+            trending,
+            (recent_mean - historical_mean) / np.where(trending, historical_mean, 1.0),
+            0.0,
+        )
 
         return features
 
@@ -496,40 +850,286 @@ class FeatureEngineer:
             start_idx: Starting index (default: minimum required history)
 
         Returns:
-            Tuple of (feature matrix, list of round indices)
+            Tuple of (float32 feature matrix, list of round indices)
         """
         if start_idx is None:
             start_idx = max(WINDOW_SIZES) + SEQUENCE_LENGTH
 
-        features_list = []
-        valid_indices = []
+        # Same minimum history as extract_features_for_round
+        valid_indices = list(range(max(start_idx, 10), len(df)))
 
-        for idx in range(start_idx, len(df)):
-            features = self.extract_features_for_round(idx, df)
-            if features is not None:
-                features_list.append(features)
-                valid_indices.append(idx)
-
-        if len(features_list) == 0:
+        if len(valid_indices) == 0:
             return np.array([]), []
 
-        # Convert to DataFrame then to numpy for consistent ordering
-        features_df = pd.DataFrame(features_list)
+        # Every feature is computed for all rounds at once, column by column
+        multipliers = df["multiplier"].values
+        batch_features = self._batch_time_features(df, valid_indices)
+        batch_features.update(self._batch_rolling_stats(df, valid_indices))
+        batch_features.update(self._batch_event_counts(multipliers, valid_indices))
+        batch_features.update(self._batch_rounds_since(multipliers, valid_indices))
+        batch_features.update(self._batch_sequence_and_ratios(multipliers, valid_indices))
+        batch_features["multiplier_trend_20"] = self._batch_multiplier_trend(
+            multipliers, valid_indices
+        )
 
-        # Ensure consistent column order
-        for col in self.feature_names:
-            if col not in features_df.columns:
-                features_df[col] = 0.0
+        # Fill a preallocated matrix (float32 is enough for XGBoost)
+        col = self.feature_index
+        X = np.zeros((len(valid_indices), len(self.feature_names)), dtype=np.float32)
 
-        features_df = features_df[self.feature_names]
+        for name, values in batch_features.items():
+            X[:, col[name]] = values
 
-        return features_df.values, valid_indices
+        return X, valid_indices
 
     def get_feature_names(self) -> List[str]:
         """Return the list of feature names in order."""
         return self.feature_names.copy()
 
 
+class _RollingWindow:
+    """
+    Trailing window over the last `size` values with O(1) updates.
+
+    Tracks the running sum and sum of squares, how many values exceed each
+    threshold and, when ordered, a sorted copy for min/max/median.
+    """
+
+    def __init__(self, size: int, thresholds: Tuple[float, ...] = (), ordered: bool = False):
+        self.size = size
+        self.values = deque()
+        self.sorted: Optional[List[float]] = [] if ordered else None
+        self.thresholds = thresholds
+        self.above = [0] * len(thresholds)
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def push(self, value: float) -> None:
+        """Append a value, evicting the oldest one once the window is full."""
+        if len(self.values) == self.size:
+            self._update(self.values.popleft(), -1)
+        self.values.append(value)
+        self._update(value, 1)
+
+    def _update(self, value: float, sign: int) -> None:
+        self.total += sign * value
+        self.total_sq += sign * value * value
+        for i, threshold in enumerate(self.thresholds):
+            if value > threshold:
+                self.above[i] += sign
+        if self.sorted is not None:
+            if sign > 0:
+                insort(self.sorted, value)
+            else:
+                del self.sorted[bisect_left(self.sorted, value)]
+
+    def mean(self) -> float:
+        return self.total / len(self.values) if self.values else 0.0
+
+    def std(self) -> float:
+        n = len(self.values)
+        if n < 2:
+            return 0.0
+        mean = self.total / n
+        return math.sqrt(max(self.total_sq / n - mean * mean, 0.0))
+
+    def median(self) -> float:
+        n = len(self.sorted)
+        if n == 0:
+            return 0.0
+        mid = n // 2
+        return self.sorted[mid] if n % 2 else (self.sorted[mid - 1] + self.sorted[mid]) / 2
+
+    def trend(self) -> float:
+        """Normalized slope over the window, as in compute_multiplier_trend."""
+        n = len(self.values)
+        if n < 2:
+            return 0.0
+        # One pass in plain Python; the window is too short to pay for NumPy
+        total = weighted = 0.0
+        for i, value in enumerate(self.values):
+            total += value
+            weighted += i * value
+        slope = (weighted - (n - 1) / 2 * total) / (n * (n * n - 1) / 12)
+        return slope / (total / n + 1e-6)
+
+
+class IncrementalFeatureState:
+    """
+    Feature state for streaming inference.
+
+    Rounds are pushed one at a time and every window statistic is updated
+    in O(1), so the features for the next round no longer depend on the
+    length of the history. The snapshot matches what FeatureEngineer
+    computes from the full history of pushed rounds.
+    """
+
+    # Every window read by the features (rolling stats, counts, early crash,
+    # trend, volatility and hot streak)
+    _MULTIPLIER_WINDOWS = sorted(set(WINDOW_SIZES).union(
+        _COUNT_WINDOWS,
+        _EARLY_CRASH_WINDOWS,
+        (_TREND_WINDOW, _VOLATILITY_RECENT_WINDOW, _VOLATILITY_HISTORICAL_WINDOW),
+    ))
+    # Rounded to the multiplier type: values and thresholds are then both
+    # exact float32 numbers, so comparing them as Python floats gives the
+    # same result as the float32 comparisons of the other feature paths
+    _THRESHOLDS = tuple(
+        float(_MULTIPLIER_TYPE(threshold))
+        for threshold in (*MULTIPLIER_THRESHOLDS, EARLY_CRASH_THRESHOLD)
+    )
+    _MAX_LOOKBACK = 200
+
+    def __init__(self, feature_engineer: Optional[FeatureEngineer] = None):
+        self.feature_engineer = feature_engineer or FeatureEngineer()
+        self.n_rounds = 0
+
+        self._multipliers = {
+            window: _RollingWindow(window, self._THRESHOLDS, ordered=window in WINDOW_SIZES)
+            for window in self._MULTIPLIER_WINDOWS
+        }
+        self._bet_counts = {window: _RollingWindow(window) for window in WINDOW_SIZES}
+        self._total_bets = {window: _RollingWindow(window) for window in WINDOW_SIZES}
+        self._total_wins = {window: _RollingWindow(window) for window in WINDOW_SIZES}
+        self._lags = deque(maxlen=SEQUENCE_LENGTH)
+        self._last_hit = {threshold: -1 for threshold in _SINCE_THRESHOLDS}
+
+        # Resolve the windows each feature block reads once, so push and
+        # snapshot iterate flat tuples instead of looking them up per call
+        engineer = self.feature_engineer
+        self._multiplier_windows = tuple(self._multipliers.values())
+        self._amount_windows = tuple(
+            (self._bet_counts[window], self._total_bets[window], self._total_wins[window])
+            for window in WINDOW_SIZES
+        )
+        self._rolling_specs = tuple(
+            (engineer._rolling_offsets[window], self._multipliers[window], *amounts)
+            for window, amounts in zip(WINDOW_SIZES, self._amount_windows)
+        )
+        self._count_specs = tuple(
+            (i, self._multipliers[window])
+            for i in range(len(MULTIPLIER_THRESHOLDS))
+            for window in _COUNT_WINDOWS
+        )
+        self._early_crash_windows = tuple(
+            self._multipliers[window] for window in _EARLY_CRASH_WINDOWS
+        )
+        self._trend_window = self._multipliers[_TREND_WINDOW]
+        self._volatility_windows = (
+            self._multipliers[_VOLATILITY_RECENT_WINDOW],
+            self._multipliers[_VOLATILITY_HISTORICAL_WINDOW],
+        )
+
+    def push(self, multiplier: float, bet_count: float, total_bet: float, total_win: float) -> None:
+        """Add the next round (chronological order) to the state."""
+        # Stored like the training data, whatever precision it arrives in
+        multiplier = float(_MULTIPLIER_TYPE(multiplier))
+
+        bet_count, total_bet, total_win = float(bet_count), float(total_bet), float(total_win)
+
+        for window in self._multiplier_windows:
+            window.push(multiplier)
+        for bet_counts, total_bets, total_wins in self._amount_windows:
+            bet_counts.push(bet_count)
+            total_bets.push(total_bet)
+            total_wins.push(total_win)
+
+        for threshold in _SINCE_THRESHOLDS:
+            if multiplier > threshold:
+                self._last_hit[threshold] = self.n_rounds
+
+        self._lags.append(multiplier)
+        self.n_rounds += 1
+
+    def extend(self, df: pd.DataFrame) -> None:
+        """
+        Push every round of a DataFrame (or structured array with the same
+        columns) sorted by time ascending.
+        """
+        for values in zip(
+            np.asarray(df["multiplier"]),
+            np.asarray(df["betCount"]),
+            np.asarray(df["totalBet"]),
+            np.asarray(df["totalWin"]),
+        ):
+            self.push(*values)
+
+    def snapshot(
+        self,
+        timestamp: datetime,
+        out: Optional[np.ndarray] = None
+    ) -> Optional[np.ndarray]:
+        """
+        Build the feature vector for the round after the last pushed one.
+
+        Args:
+            timestamp: Time used for the time features of the next round
+            out: Optional preallocated row to write into (every feature is
+                overwritten)
+
+        Returns:
+            Float32 array in feature_names order, or None if fewer than
+            10 rounds have been pushed
+        """
+        if self.n_rounds < 10:
+            return None
+
+        engineer = self.feature_engineer
+        row = out if out is not None else np.zeros(len(engineer.feature_names), dtype=np.float32)
+
+        engineer.extract_time_features(timestamp, row)
+
+        for offset, mult, bet_counts, total_bets, total_wins in self._rolling_specs:
+            total_bet_mean = total_bets.mean()
+            total_win_mean = total_wins.mean()
+
+            row[offset:offset + 9] = (
+                mult.mean(),
+                mult.std(),
+                mult.sorted[0],
+                mult.sorted[-1],
+                mult.median(),
+                bet_counts.mean(),
+                total_bet_mean,
+                total_win_mean,
+                total_bet_mean - total_win_mean,
+            )
+
+        offset = engineer._count_offset
+        row[offset:offset + len(self._count_specs)] = [
+            mult.above[i] for i, mult in self._count_specs
+        ]
+
+        offset = engineer._since_offset
+        for i, threshold in enumerate(_SINCE_THRESHOLDS):
+            since = self.n_rounds - 1 - self._last_hit[threshold]
+            row[offset + i] = min(since, self._MAX_LOOKBACK)
+
+        offset = engineer._early_crash_offset
+        for i, mult in enumerate(self._early_crash_windows):
+            early_crashes = len(mult.values) - mult.above[-1]
+            row[offset + i] = early_crashes / len(mult.values)
+
+        offset = engineer._lag_offset
+        row[offset:offset + len(self._lags)] = list(reversed(self._lags))
+        row[offset + len(self._lags):offset + SEQUENCE_LENGTH] = 0.0
+
+        recent, historical = self._volatility_windows
+        volatility_ratio, hot_streak = 1.0, 0.0
+        if self.n_rounds >= _VOLATILITY_RECENT_WINDOW:
+            historical_std = historical.std()
+            if historical_std >= 1e-6:
+                volatility_ratio = recent.std() / historical_std
+
+            historical_mean = historical.mean()
+            if historical_mean >= 1e-6:
+                hot_streak = (recent.mean() - historical_mean) / historical_mean
+
+        offset = engineer._derived_offset
+        row[offset:offset + 3] = (self._trend_window.trend(), volatility_ratio, hot_streak)
+
+        return row
+
+
 class LabelGenerator:
     """
     Generates binary labels for training the models.
@@ -539,6 +1139,18 @@ class LabelGenerator:
     are computed using only past data.
     """
 
+    # Threshold labels (multiplier > threshold), in label order
+    THRESHOLD_LABELS = {
+        "label_gt_1_5x": 1.5,
+        "label_gt_2x": 2.0,
+        "label_gt_3x": 3.0,
+        "label_gt_4x": 4.0,
+        "label_gt_5x": 5.0,
+        "label_gt_7x": 7.0,
+        "label_gt_10x": 10.0,
+    }
+    LABEL_NAMES = list(THRESHOLD_LABELS) + ["label_early_crash", "label_high_loss_streak"]
+
     @staticmethod
     def generate_threshold_labels(
         multipliers: np.ndarray,
@@ -552,9 +1164,9 @@ class LabelGenerator:
             threshold: Threshold for binary classification
 
         Returns:
-            Binary array (1 if multiplier > threshold, else 0)
+            Binary int8 array (1 if multiplier > threshold, else 0)
         """
-        return (multipliers > threshold).astype(int)
+        return (multipliers > threshold).astype(np.int8)
 
     @staticmethod
     def generate_early_crash_labels(
@@ -569,9 +1181,9 @@ class LabelGenerator:
             threshold: Early crash threshold (default from config)
 
         Returns:
-            Binary array (1 if multiplier <= threshold, else 0)
+            Binary int8 array (1 if multiplier <= threshold, else 0)
         """
-        return (multipliers <= threshold).astype(int)
+        return (multipliers <= threshold).astype(np.int8)
 
     @staticmethod
     def generate_high_loss_streak_labels(
@@ -597,27 +1209,56 @@ class LabelGenerator:
             threshold_factor: Factor above historical average
 
         Returns:
-            Binary array of labels
+            Binary int8 array of labels
         """
         multipliers = df["multiplier"].values
         n = len(multipliers)
 
         # Compute historical average proportion of rounds below 2x
         # Using all data for the historical baseline
-        below_2x = (multipliers < 2.0).astype(float)
+        below_2x = multipliers < 2.0
         historical_avg = np.mean(below_2x)
 
         # Threshold for "high loss streak"
         streak_threshold = historical_avg * threshold_factor
 
-        labels = np.zeros(n, dtype=int)
+        labels = np.zeros(n, dtype=np.int8)
+
+        if n > window:
+            # Proportion of rounds below 2x in the window BEFORE each round,
+            # from a running count instead of one mean per round
+            below_counts = _prefix_sum(below_2x, np.int64)
+            window_proportion = (below_counts[window:n] - below_counts[:n - window]) / window
+            labels[window:] = window_proportion > streak_threshold
+
+        return labels
+
+    @staticmethod
+    def generate_label_matrix(df: pd.DataFrame) -> np.ndarray:
+        """
+        Generate all labels as a single int8 matrix.
+
+        The threshold labels come from one broadcast comparison, followed
+        by the early crash and high loss streak rows.
+
+        Args:
+            df: DataFrame with rounds data
 
-        for i in range(window, n):
-            # Proportion of rounds below 2x in the window BEFORE this round
-            window_proportion = np.mean(below_2x[i - window:i])
+        Returns:
+            Array of shape (len(LABEL_NAMES), n_rounds), rows in LABEL_NAMES order
+        """
+        multipliers = df["multiplier"].values
+        n_thresholds = len(LabelGenerator.THRESHOLD_LABELS)
+
+        labels = np.empty((len(LabelGenerator.LABEL_NAMES), len(multipliers)), dtype=np.int8)
 
-            if window_proportion > streak_threshold:
-                labels[i] = 1
+        thresholds = np.array(
+            list(LabelGenerator.THRESHOLD_LABELS.values()),
+            dtype=np.result_type(multipliers.dtype, np.float32),
+        )
+        np.greater(multipliers, thresholds[:, None], out=labels[:n_thresholds])
+        np.less_equal(multipliers, EARLY_CRASH_THRESHOLD, out=labels[n_thresholds])
+        labels[n_thresholds + 1] = LabelGenerator.generate_high_loss_streak_labels(df)
 
         return labels
 
@@ -630,26 +1271,49 @@ class LabelGenerator:
             df: DataFrame with rounds data
 
         Returns:
-            Dictionary mapping label names to arrays
+            Dictionary mapping label names to arrays (views into one matrix)
         """
-        multipliers = df["multiplier"].values
+        return dict(zip(LabelGenerator.LABEL_NAMES, LabelGenerator.generate_label_matrix(df)))
 
-        labels = {
-            "label_gt_1_5x": LabelGenerator.generate_threshold_labels(multipliers, 1.5),
-            "label_gt_2x": LabelGenerator.generate_threshold_labels(multipliers, 2.0),
-            "label_gt_3x": LabelGenerator.generate_threshold_labels(multipliers, 3.0),
-            "label_gt_4x": LabelGenerator.generate_threshold_labels(multipliers, 4.0),
-            "label_gt_5x": LabelGenerator.generate_threshold_labels(multipliers, 5.0),
-            "label_gt_7x": LabelGenerator.generate_threshold_labels(multipliers, 7.0),
-            "label_gt_10x": LabelGenerator.generate_threshold_labels(multipliers, 10.0),
-            "label_early_crash": LabelGenerator.generate_early_crash_labels(multipliers),
-            "label_high_loss_streak": LabelGenerator.generate_high_loss_streak_labels(df),
-        }
 
-        return labels
+# Column order of the rounds read from SQLite by training and inference
+ROUND_COLUMNS = ("id", "createdAt", "betCount", "totalBet", "totalWin", "multiplier")
 
 
-def create_training_dataset(df: pd.DataFrame) -> Tuple[np.ndarray, Dict[str, np.ndarray], List[int]]:
+def round_dtype(created_at_length: int) -> np.dtype:
+    """
+    Row layout of the rounds read from SQLite (columns in ROUND_COLUMNS order).
+
+    Training and inference share it, so the service computes features from
+    the same ROUND_DTYPES values the models were trained on.
+
+    Args:
+        created_at_length: Length of the longest createdAt string to hold
+
+    Returns:
+        Structured dtype
+    """
+    return np.dtype([
+        ("id", np.int64),
+        ("createdAt", f"U{max(created_at_length, 1)}"),
+        *((column, ROUND_DTYPES[column]) for column in ROUND_COLUMNS[2:]),
+    ])
+
+
+def rounds_to_array(rows: Sequence[tuple]) -> np.ndarray:
+    """
+    Convert rows selected in ROUND_COLUMNS order into a structured array.
+
+    The createdAt field is sized to the longest value, so timestamps are
+    never truncated.
+    """
+    width = max((len(row[1]) for row in rows), default=1)
+    return np.array(rows, dtype=round_dtype(width))
+
+
+def create_training_dataset(
+    df: Union[pd.DataFrame, np.ndarray]
+) -> Tuple[np.ndarray, Dict[str, np.ndarray], List[int]]:
     """
     Create a complete training dataset from raw rounds data.
 
@@ -660,14 +1324,18 @@ def create_training_dataset(df: pd.DataFrame) -> Tuple[np.ndarray, Dict[str, np.
     4. Aligns features and labels by round index
 
     Args:
-        df: DataFrame with columns [id, createdAt, betCount, totalBet, totalWin, multiplier]
+        df: DataFrame or structured array with columns
+            [id, createdAt, betCount, totalBet, totalWin, multiplier]
 
     Returns:
         Tuple of:
         - Feature matrix (n_samples x n_features)
-        - Dictionary of label arrays
+        - Dictionary of label arrays (views into one int8 matrix)
         - List of valid round indices
     """
+    if isinstance(df, np.ndarray):
+        df = pd.DataFrame(df)
+
     # Ensure sorted by time
     df = df.sort_values("createdAt").reset_index(drop=True)
 
@@ -678,18 +1346,15 @@ def create_training_dataset(df: pd.DataFrame) -> Tuple[np.ndarray, Dict[str, np.
     if len(X) == 0:
         return np.array([]), {}, []
 
-    # Generate labels for all rounds
-    all_labels = LabelGenerator.generate_all_labels(df)
-
-    # Subset labels to match valid indices
-    labels = {}
-    for name, arr in all_labels.items():
-        labels[name] = arr[valid_indices]
+    # Generate labels for all rounds and subset them to match valid indices
+    # (one gather for all labels; each row stays contiguous)
+    label_matrix = LabelGenerator.generate_label_matrix(df)[:, valid_indices]
+    labels = dict(zip(LabelGenerator.LABEL_NAMES, label_matrix))
 
     logger.info(f"Created dataset with {len(X)} samples and {X.shape[1]} features")
     logger.info(f"Label distribution:")
-    for name, arr in labels.items():
-        pos = np.sum(arr)
-        logger.info(f"  {name}: {pos}/{len(arr)} positive ({100*pos/len(arr):.1f}%)")
+    positives = label_matrix.sum(axis=1)
+    for name, pos in zip(labels, positives):
+        logger.info(f"  {name}: {pos}/{len(X)} positive ({100*pos/len(X):.1f}%)")
 
     return X, labels, valid_indices
@@ -3,25 +3,29 @@ Inference Service for Crash Game ML Predictions.
 
 This service:
 1. Loads trained models into memory
-2. Monitors SQLite for new rounds (polling)
+2. Waits for new rounds (Redis notifications, or SQLite polling as fallback)
 3. Generates predictions for each new round
 4. Publishes predictions to Redis Pub/Sub
 
 The service runs continuously until stopped.
 """
 
+import os
 import sqlite3
 import time
-import json
 import logging
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Optional, List
 
 import numpy as np
-import pandas as pd
 import joblib
+import orjson
 import redis
+import xgboost as xgb
 
 from config import (
     DATABASE_PATH,
@@ -33,13 +37,16 @@ from config import (
     REDIS_DB,
     REDIS_PASSWORD,
     REDIS_CHANNEL_PREDICTIONS,
+    REDIS_CHANNEL_NEW_ROUNDS,
     POLLING_INTERVAL,
+    WATCHDOG_INTERVAL,
+    SUBSCRIBER_CHECK_INTERVAL,
     MIN_ROUNDS_FOR_PREDICTION,
     WINDOW_SIZES,
     SEQUENCE_LENGTH,
-    MULTIPLIER_THRESHOLDS,
+    XGBOOST_DEVICE,
 )
-from features import FeatureEngineer
+from features import FeatureEngineer, IncrementalFeatureState, rounds_to_array
 
 # Setup logging
 logging.basicConfig(
@@ -48,6 +55,36 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Constant statement text, so sqlite3's statement cache reuses the parsed plan
+_SQL_LATEST = """
+    SELECT * FROM (
+        SELECT
+            id,
+            createdAt,
+            betCount,
+            totalBet,
+            totalWin,
+            multiplier
+        FROM rounds
+        ORDER BY id DESC
+        LIMIT ?
+    )
+    ORDER BY id ASC
+"""
+
+_SQL_NEW = """
+    SELECT
+        id,
+        createdAt,
+        betCount,
+        totalBet,
+        totalWin,
+        multiplier
+    FROM rounds
+    WHERE id > ?
+    ORDER BY id ASC
+"""
+
 
 class CrashMLInferenceService:
     """
@@ -66,10 +103,27 @@ class CrashMLInferenceService:
         """
         self.db_path = db_path
         self.models = {}
+        # Trimmed booster per model, for prediction on a shared DMatrix
+        self._boosters: Dict[str, xgb.Booster] = {}
         self.scaler = None
+        # Inner quantile bin edges per feature, when the models take binned features
+        self._bin_edges: Optional[List[np.ndarray]] = None
         self.feature_engineer = FeatureEngineer()
+        self.feature_state = IncrementalFeatureState(self.feature_engineer)
+        # Reused for every prediction (1 x n_features)
+        self._feature_buffer = np.zeros(
+            (1, len(self.feature_engineer.feature_names)), dtype=np.float32
+        )
+        self._scaled_buffer = np.zeros_like(self._feature_buffer)
+        self._binned_buffer = np.zeros(self._feature_buffer.shape, dtype=np.uint8)
+        self._scaler_mean = None
+        self._scaler_scale = None
         self.redis_client = None
+        # Cached subscriber count of the predictions channel
+        self._subscribers = 0
+        self._subscribers_checked_at = float("-inf")
         self.last_processed_id = 0
+        self._conn: Optional[sqlite3.Connection] = None
         self._running = False
 
     def load_models(self) -> None:
@@ -81,23 +135,116 @@ class CrashMLInferenceService:
             "gt_7x", "gt_10x", "early_crash", "high_loss_streak"
         ]
 
-        for key in model_keys:
-            model_path = MODELS_DIR / MODEL_FILES[key]
-            if model_path.exists():
-                self.models[key] = joblib.load(model_path)
+        # Deserialize the model files concurrently
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+            futures = {}
+            for key in model_keys:
+                model_path = MODELS_DIR / MODEL_FILES[key]
+                if model_path.exists():
+                    futures[key] = executor.submit(joblib.load, model_path)
+                else:
+                    logger.warning(f"  Model not found: {model_path}")
+
+            for key, future in futures.items():
+                model = future.result()
+                # Predict on this machine's device, whatever the model was trained on
+                model.set_params(device=XGBOOST_DEVICE)
+                self.models[key] = model
+                self._boosters[key] = self._prediction_booster(model)
                 logger.info(f"  Loaded model: {key}")
-            else:
-                logger.warning(f"  Model not found: {model_path}")
 
-        # Load scaler
+        # Models trained on binned features need the same bins; the others
+        # take scaled features
+        feature_binning = self._load_feature_binning()
+        if feature_binning is not None:
+            self._bin_edges = self._load_bin_edges(feature_binning)
+            logger.info(
+                f"  Loaded feature bin edges ({feature_binning['strategy']}, "
+                f"{feature_binning['n_bins']} bins)"
+            )
+        else:
+            self._load_scaler()
+
+        logger.info(f"Loaded {len(self.models)} models")
+
+        # The first prediction of each booster is several times slower than
+        # the next ones; pay it now rather than on the first round
+        if self.models:
+            self.generate_predictions(np.zeros_like(self._feature_buffer))
+
+    @staticmethod
+    def _load_feature_binning() -> Optional[Dict]:
+        """
+        Read the feature binning recorded in the training metadata.
+
+        Returns:
+            Binning description, or None if the models were trained
+            without binning
+        """
+        metadata_path = MODELS_DIR / "training_metadata.json"
+        if not metadata_path.exists():
+            logger.warning(f"  Training metadata not found: {metadata_path}")
+            return None
+
+        with open(metadata_path) as f:
+            metadata = json.load(f)
+
+        return metadata.get("feature_binning")
+
+    @staticmethod
+    def _load_bin_edges(feature_binning: Dict) -> List[np.ndarray]:
+        """
+        Load the bin edges the models were trained with.
+
+        Args:
+            feature_binning: Binning description from the training metadata
+
+        Returns:
+            Inner edges per feature (the outer ones never change the bin)
+
+        Raises:
+            FileNotFoundError: If the bin edges file is missing
+            ValueError: If the file is not the one the models were trained with
+        """
+        edges_path = MODELS_DIR / feature_binning["file"]
+        if not edges_path.exists():
+            raise FileNotFoundError(f"Feature bin edges not found at {edges_path}")
+
+        if hashlib.sha256(edges_path.read_bytes()).hexdigest() != feature_binning["sha256"]:
+            raise ValueError(f"Feature bin edges at {edges_path} do not match the training metadata")
+
+        return [edges[1:-1] for edges in joblib.load(edges_path)]
+
+    def _load_scaler(self) -> None:
+        """Load the feature scaler of models trained on scaled features."""
         scaler_path = MODELS_DIR / MODEL_FILES["scaler"]
         if scaler_path.exists():
             self.scaler = joblib.load(scaler_path)
+            # Applied inline in generate_predictions as (x - mean_) / scale_, with the
+            # parameters in float32 like StandardScaler uses for float32 input
+            n_features = self.scaler.n_features_in_
+            mean = self.scaler.mean_ if self.scaler.with_mean else np.zeros(n_features)
+            scale = self.scaler.scale_ if self.scaler.with_std else np.ones(n_features)
+            self._scaler_mean = mean.astype(np.float32)
+            self._scaler_scale = scale.astype(np.float32)
             logger.info("  Loaded feature scaler")
         else:
             logger.warning("  Scaler not found, predictions may be inaccurate")
 
-        logger.info(f"Loaded {len(self.models)} models")
+    @staticmethod
+    def _prediction_booster(model) -> xgb.Booster:
+        """
+        Return the booster with only the trees predict_proba would use.
+
+        With early stopping the trees after the best iteration are never
+        used, so they are sliced off once here instead of being skipped via
+        iteration_range on every prediction.
+        """
+        booster = model.get_booster()
+        best_iteration = getattr(model, "best_iteration", None)
+        if best_iteration is None:
+            return booster
+        return booster[: best_iteration + 1]
 
     def connect_redis(self) -> None:
         """Connect to Redis server."""
@@ -119,163 +266,56 @@ class CrashMLInferenceService:
             logger.error(f"  Redis connection failed: {e}")
             raise
 
-    def get_latest_rounds(self, limit: int = 200) -> pd.DataFrame:
-        """
-        Get the latest rounds from SQLite.
-
-        Args:
-            limit: Maximum number of rounds to fetch
-
-        Returns:
-            DataFrame with rounds data
-        """
-        conn = sqlite3.connect(self.db_path)
-
-        query = f"""
-            SELECT
-                id,
-                createdAt,
-                betCount,
-                totalBet,
-                totalWin,
-                multiplier
-            FROM rounds
-            ORDER BY id DESC
-            LIMIT {limit}
-        """
-
-        df = pd.read_sql_query(query, conn)
-        conn.close()
-
-        # Reverse to chronological order
-        df = df.iloc[::-1].reset_index(drop=True)
-
-        return df
-
-    def get_new_rounds_since(self, last_id: int) -> pd.DataFrame:
-        """
-        Get rounds with id > last_id.
-
-        Args:
-            last_id: Last processed round ID
-
-        Returns:
-            DataFrame with new rounds
+    def _ensure_conn(self) -> sqlite3.Connection:
         """
-        conn = sqlite3.connect(self.db_path)
+        Return the SQLite connection, opening it on first use.
 
-        query = f"""
-            SELECT
-                id,
-                createdAt,
-                betCount,
-                totalBet,
-                totalWin,
-                multiplier
-            FROM rounds
-            WHERE id > {last_id}
-            ORDER BY id ASC
+        The connection is kept for the life of the service so the page cache
+        stays warm between polls. The database is in WAL mode (set by the
+        collector), so reads never block its writes.
         """
+        if self._conn is None:
+            self._conn = sqlite3.connect(
+                self.db_path,
+                timeout=5.0,  # busy timeout in seconds
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            self._conn.execute("PRAGMA cache_size = -20000")  # ~20 MB
+        return self._conn
 
-        df = pd.read_sql_query(query, conn)
-        conn.close()
-
-        return df
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
 
-    def extract_features_for_prediction(self, df: pd.DataFrame) -> Optional[np.ndarray]:
+    def get_latest_rounds(self, limit: int = 200) -> np.ndarray:
         """
-        Extract features for predicting the next round.
-
-        Uses all available history to generate features.
+        Get the latest rounds from SQLite.
 
         Args:
-            df: DataFrame with historical rounds
+            limit: Maximum number of rounds to fetch
 
         Returns:
-            Feature array or None if insufficient data
+            Structured array (round_dtype) in chronological order
         """
-        if len(df) < MIN_ROUNDS_FOR_PREDICTION:
-            logger.warning(f"Insufficient data for prediction: {len(df)} rounds")
-            return None
-
-        # Use the last valid index (len(df) - 1) since we want to use
-        # all data up to and including the last round to predict the NEXT round
-        # The extract_features_for_round uses data BEFORE round_idx,
-        # so we pass len(df) - 1 which will use data from indices 0 to len(df)-2
-        # But we want to use ALL data, so we need a different approach
+        conn = self._ensure_conn()
+        # The query returns the rows in chronological order
+        return rounds_to_array(conn.execute(_SQL_LATEST, (limit,)).fetchall())
 
-        # Extract features manually using all available data
-        features = self._extract_features_for_next_round(df)
-
-        if features is None:
-            return None
-
-        # Convert to array in correct order
-        feature_names = self.feature_engineer.get_feature_names()
-        feature_array = np.array([features.get(name, 0.0) for name in feature_names])
-
-        return feature_array.reshape(1, -1)
-
-    def _extract_features_for_next_round(self, df: pd.DataFrame) -> Optional[Dict[str, float]]:
+    def get_new_rounds_since(self, last_id: int) -> np.ndarray:
         """
-        Extract features using ALL available data to predict the next round.
+        Get rounds with id > last_id.
 
         Args:
-            df: DataFrame with all historical rounds
+            last_id: Last processed round ID
 
         Returns:
-            Dictionary of features
+            Structured array (round_dtype) in id order
         """
-        if len(df) < 10:
-            return None
-
-        # Use all data as history
-        multipliers = df["multiplier"].values
-        bet_counts = df["betCount"].values
-        total_bets = df["totalBet"].values
-        total_wins = df["totalWin"].values
-
-        # Use current time for time features (predicting the next round)
-        timestamp = datetime.now()
-
-        features = {}
-
-        # 1. Time features
-        features.update(self.feature_engineer.extract_time_features(timestamp))
-
-        # 2. Rolling statistics for each window size
-        for window in WINDOW_SIZES:
-            features.update(self.feature_engineer.compute_rolling_stats(
-                multipliers, bet_counts, total_bets, total_wins, window
-            ))
-
-        # 3. Event counts
-        for threshold in MULTIPLIER_THRESHOLDS:
-            for window in [50, 100]:
-                key = f"count_gt_{threshold}x_last_{window}"
-                features[key] = self.feature_engineer.count_events_above_threshold(
-                    multipliers, threshold, window
-                )
-
-        # 4. Distance since last event
-        for threshold in [2.0, 5.0, 10.0]:
-            key = f"rounds_since_gt_{threshold}x"
-            features[key] = self.feature_engineer.rounds_since_event(multipliers, threshold)
-
-        # 5. Early crash rate
-        for window in [20, 50]:
-            key = f"early_crash_rate_{window}"
-            features[key] = self.feature_engineer.compute_early_crash_rate(multipliers, window)
-
-        # 6. Sequence features (last N multipliers)
-        features.update(self.feature_engineer.compute_sequence_features(multipliers))
-
-        # 7. Derived features
-        features["multiplier_trend_20"] = self.feature_engineer.compute_multiplier_trend(multipliers, 20)
-        features["volatility_ratio"] = self.feature_engineer.compute_volatility_ratio(multipliers)
-        features["hot_streak_indicator"] = self.feature_engineer.compute_hot_streak_indicator(multipliers)
-
-        return features
+        conn = self._ensure_conn()
+        return rounds_to_array(conn.execute(_SQL_NEW, (last_id,)).fetchall())
 
     def generate_predictions(self, features: np.ndarray) -> Dict[str, float]:
         """
@@ -287,11 +327,25 @@ class CrashMLInferenceService:
         Returns:
             Dictionary of prediction probabilities
         """
-        # Scale features
-        if self.scaler is not None:
-            features_scaled = self.scaler.transform(features)
+        if self._bin_edges is not None:
+            # Same bins as KBinsDiscretizer.transform, written into a reused buffer
+            if features.shape == self._binned_buffer.shape:
+                model_input = self._binned_buffer
+            else:
+                model_input = np.empty(features.shape, dtype=np.uint8)
+            for row, binned in zip(features, model_input):
+                for i, edges in enumerate(self._bin_edges):
+                    binned[i] = np.searchsorted(edges, row[i], side="right")
+        elif self.scaler is not None:
+            # Same arithmetic as StandardScaler.transform, into a reused buffer
+            if features.shape == self._scaled_buffer.shape:
+                model_input = self._scaled_buffer
+            else:
+                model_input = np.empty(features.shape, dtype=np.float32)
+            np.subtract(features, self._scaler_mean, out=model_input)
+            np.divide(model_input, self._scaler_scale, out=model_input)
         else:
-            features_scaled = features
+            model_input = features
 
         predictions = {}
 
@@ -307,11 +361,15 @@ class CrashMLInferenceService:
             "high_loss_streak": "prob_high_loss_streak",
         }
 
+        # Build the input once and share it across all models
+        dmatrix = xgb.DMatrix(model_input)
+
         for model_key, output_key in model_to_output.items():
-            if model_key in self.models:
+            if model_key in self._boosters:
                 try:
-                    proba = self.models[model_key].predict_proba(features_scaled)
-                    predictions[output_key] = float(proba[0, 1])
+                    # Binary logistic boosters predict P(label = 1) directly
+                    proba = self._boosters[model_key].predict(dmatrix)
+                    predictions[output_key] = float(proba[0])
                 except Exception as e:
                     logger.error(f"Error predicting {model_key}: {e}")
                     predictions[output_key] = 0.5
@@ -357,42 +415,88 @@ class CrashMLInferenceService:
         Args:
             message: Prediction message dictionary
         """
+        self.publish_predictions([message])
+
+    def has_subscribers(self) -> bool:
+        """
+        Check whether anyone listens on the predictions channel.
+
+        The count is refreshed with PUBSUB NUMSUB at most every
+        SUBSCRIBER_CHECK_INTERVAL seconds and updated by every publish.
+        """
+        now = time.monotonic()
+        if now - self._subscribers_checked_at >= SUBSCRIBER_CHECK_INTERVAL:
+            try:
+                [(_, self._subscribers)] = self.redis_client.pubsub_numsub(
+                    REDIS_CHANNEL_PREDICTIONS
+                )
+            except Exception as e:
+                logger.error(f"Could not check Redis subscribers: {e}")
+                self._subscribers = 1  # Publish anyway
+            self._subscribers_checked_at = now
+        return self._subscribers > 0
+
+    def publish_predictions(self, messages: List[Dict]) -> None:
+        """
+        Publish several predictions to the Redis channel in one round trip.
+
+        Nothing is encoded or sent while the channel has no subscribers.
+
+        Args:
+            messages: Prediction message dictionaries, in round order
+        """
         if self.redis_client is None:
             logger.warning("Redis not connected, skipping publish")
             return
 
+        if not self.has_subscribers():
+            logger.info(f"No subscribers, skipping publish of {len(messages)} prediction(s)")
+            return
+
         try:
-            message_json = json.dumps(message)
-            subscribers = self.redis_client.publish(
-                REDIS_CHANNEL_PREDICTIONS,
-                message_json
-            )
-            logger.info(
-                f"Published prediction for round {message['round_id']} "
-                f"to {subscribers} subscriber(s)"
-            )
+            pipe = self.redis_client.pipeline(transaction=False)
+            for message in messages:
+                pipe.publish(REDIS_CHANNEL_PREDICTIONS, orjson.dumps(message))
+            results = pipe.execute()
+
+            for message, subscribers in zip(messages, results):
+                logger.info(
+                    f"Published prediction for round {message['round_id']} "
+                    f"to {subscribers} subscriber(s)"
+                )
+            self._subscribers = results[-1]
         except Exception as e:
             logger.error(f"Failed to publish to Redis: {e}")
 
-    def process_new_round(self, new_round_id: int, history_df: pd.DataFrame) -> None:
+    def build_prediction_message(self, new_round_id: int) -> Optional[Dict]:
         """
-        Process a new round and generate predictions.
+        Generate the prediction message for the round after a new round.
+
+        The round must already be pushed into the feature state.
 
         Args:
             new_round_id: ID of the newly completed round
-            history_df: Historical data including the new round
+
+        Returns:
+            Message dictionary or None if no prediction could be made
         """
         logger.info(f"Processing new round: {new_round_id}")
 
-        # Extract features
-        features = self.extract_features_for_prediction(history_df)
+        if self.feature_state.n_rounds < MIN_ROUNDS_FOR_PREDICTION:
+            logger.warning(
+                f"Insufficient data for prediction: {self.feature_state.n_rounds} rounds"
+            )
+            return None
+
+        # Extract features (current time for the time features of the next round)
+        features = self.feature_state.snapshot(datetime.now(), out=self._feature_buffer[0])
 
         if features is None:
             logger.warning("Could not extract features, skipping prediction")
-            return
+            return None
 
         # Generate predictions
-        predictions = self.generate_predictions(features)
+        predictions = self.generate_predictions(self._feature_buffer)
 
         # Determine feature window
         min_window = max(WINDOW_SIZES) + SEQUENCE_LENGTH
@@ -412,14 +516,83 @@ class CrashMLInferenceService:
         for key, value in predictions.items():
             logger.info(f"  {key}: {value:.3f}")
 
-        # Publish to Redis
-        self.publish_prediction(message)
+        return message
+
+    def process_pending_rounds(self) -> None:
+        """
+        Consume the rounds not processed yet and predict the next round.
+
+        Every new round updates the feature state, but only the latest one
+        gets a prediction: when several rounds arrive together, the rounds
+        the earlier ones would predict have already been played.
+        """
+        new_rounds = self.get_new_rounds_since(self.last_processed_id)
+        if len(new_rounds) == 0:
+            return
+
+        # Update the feature state to include every new round
+        self.feature_state.extend(new_rounds)
+
+        if len(new_rounds) > 1:
+            logger.info(f"{len(new_rounds)} new rounds, predicting after the latest only")
+
+        round_id = int(new_rounds["id"][-1])
+        self.last_processed_id = round_id
+
+        message = self.build_prediction_message(round_id)
+        if message is not None:
+            self.publish_prediction(message)
+
+    def subscribe_new_rounds(self) -> Optional[redis.client.PubSub]:
+        """
+        Subscribe to the new-round notifications published by the observer.
+
+        Returns:
+            PubSub object, or None if Redis is not available
+        """
+        if self.redis_client is None:
+            return None
+
+        try:
+            pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(REDIS_CHANNEL_NEW_ROUNDS)
+            return pubsub
+        except Exception as e:
+            logger.error(f"Could not subscribe to new rounds: {e}")
+            return None
+
+    def wait_for_new_round(self, pubsub: redis.client.PubSub) -> None:
+        """
+        Block until a new round is announced or WATCHDOG_INTERVAL passes.
+
+        The notification only wakes the service up; the rounds themselves
+        are read from the database, so a missed message is picked up by
+        the next check.
+        """
+        deadline = time.monotonic() + WATCHDOG_INTERVAL
+        while self._running:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            if pubsub.get_message(timeout=remaining) is not None:
+                # Drain notifications that arrived together into one check
+                while pubsub.get_message(timeout=0) is not None:
+                    pass
+                return
 
     def initialize_last_processed_id(self) -> None:
-        """Initialize the last processed round ID from the database."""
-        df = self.get_latest_rounds(limit=1)
-        if len(df) > 0:
-            self.last_processed_id = int(df["id"].iloc[-1])
+        """
+        Initialize the last processed round ID from the database.
+
+        Also seeds the feature state with the latest rounds, so later
+        rounds only need to be pushed as they arrive.
+        """
+        rounds = self.get_latest_rounds(limit=max(WINDOW_SIZES) + SEQUENCE_LENGTH + 50)
+        self.feature_state = IncrementalFeatureState(self.feature_engineer)
+        self.feature_state.extend(rounds)
+
+        if len(rounds) > 0:
+            self.last_processed_id = int(rounds["id"][-1])
             logger.info(f"Initialized last processed ID: {self.last_processed_id}")
         else:
             self.last_processed_id = 0
@@ -429,7 +602,10 @@ class CrashMLInferenceService:
         """
         Main loop for the inference service.
 
-        Polls the database for new rounds and generates predictions.
+        Waits for new-round notifications on Redis (checking the database
+        every WATCHDOG_INTERVAL anyway), or polls the database every
+        POLLING_INTERVAL when Redis is unavailable, and generates
+        predictions for the new rounds.
         """
         logger.info("=" * 60)
         logger.info("Starting Crash Game ML Inference Service")
@@ -452,33 +628,24 @@ class CrashMLInferenceService:
         # Initialize state
         self.initialize_last_processed_id()
 
-        logger.info(f"\nPolling for new rounds every {POLLING_INTERVAL} seconds...")
+        pubsub = self.subscribe_new_rounds()
+        if pubsub is not None:
+            logger.info(f"\nWaiting for new rounds on '{REDIS_CHANNEL_NEW_ROUNDS}'...")
+        else:
+            logger.info(f"\nPolling for new rounds every {POLLING_INTERVAL} seconds...")
         logger.info("Press Ctrl+C to stop\n")
 
         self._running = True
 
         while self._running:
             try:
-                # Check for new rounds
-                new_rounds_df = self.get_new_rounds_since(self.last_processed_id)
-
-                if len(new_rounds_df) > 0:
-                    # Get full history for feature extraction
-                    history_df = self.get_latest_rounds(
-                        limit=max(WINDOW_SIZES) + SEQUENCE_LENGTH + 50
-                    )
+                self.process_pending_rounds()
 
-                    # Process each new round
-                    for _, row in new_rounds_df.iterrows():
-                        round_id = int(row["id"])
-
-                        # Update history to include this round
-                        self.process_new_round(round_id, history_df)
-
-                        self.last_processed_id = round_id
-
-                # Wait before next poll
-                time.sleep(POLLING_INTERVAL)
+                # Wait for the next round
+                if pubsub is not None:
+                    self.wait_for_new_round(pubsub)
+                else:
+                    time.sleep(POLLING_INTERVAL)
 
             except KeyboardInterrupt:
                 logger.info("\nReceived shutdown signal")
@@ -486,8 +653,13 @@ class CrashMLInferenceService:
 
             except Exception as e:
                 logger.error(f"Error in main loop: {e}")
+                # Reopen the connection on the next poll in case it went bad
+                self.close()
                 time.sleep(POLLING_INTERVAL)
 
+        if pubsub is not None:
+            pubsub.close()
+        self.close()
         logger.info("Inference service stopped")
 
     def stop(self) -> None:
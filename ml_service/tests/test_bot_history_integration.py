@@ -0,0 +1,48 @@
+"""
+Tests for loading the bot history in bot_history_integration.py.
+"""
+
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bot_history_integration import (
+    BotHistoryAnalyzer,
+    get_bot_performance_features,
+    get_optimal_thresholds_from_history,
+)
+
+
+class MissingHistoryTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp_dir = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_missing_database(self):
+        db_path = self.tmp_dir / "missing.db"
+
+        self.assertFalse(BotHistoryAnalyzer(db_path).load_bot_history())
+        self.assertIsNone(get_bot_performance_features(db_path))
+        self.assertEqual(get_optimal_thresholds_from_history(db_path), {})
+        # Nothing is created by the read-only analyzer
+        self.assertFalse(db_path.exists())
+
+    def test_database_without_bot_bets(self):
+        db_path = self.tmp_dir / "crash_stats.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE rounds (id INTEGER PRIMARY KEY)")
+        conn.close()
+
+        self.assertFalse(BotHistoryAnalyzer(db_path).load_bot_history())
+        self.assertEqual(get_optimal_thresholds_from_history(db_path), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
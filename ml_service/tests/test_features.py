@@ -0,0 +1,158 @@
+"""
+Tests for the feature paths: streaming state, single row and batch.
+"""
+
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from unittest import mock
+
+from sklearn.preprocessing import KBinsDiscretizer
+
+from config import WINDOW_SIZES
+from features import (
+    FeatureEngineer,
+    IncrementalFeatureState,
+    create_training_dataset,
+    rounds_to_array,
+)
+import inference
+import training
+
+
+def make_rounds(multipliers, seed=0):
+    """Build rounds (as read from SQLite) around the given multipliers."""
+    rng = np.random.default_rng(seed)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    rows = []
+    for i, multiplier in enumerate(multipliers):
+        created_at = (start + timedelta(seconds=23 * i)).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        total_bet = float(rng.uniform(100.0, 5000.0))
+        rows.append((
+            i + 1,
+            created_at,
+            int(rng.integers(10, 500)),
+            round(total_bet, 2),
+            round(total_bet * float(rng.uniform(0.0, 1.5)), 2),
+            float(multiplier),
+        ))
+    return rounds_to_array(rows)
+
+
+def row_features(engineer, rounds, idx):
+    """Features of round idx from extract_features_row."""
+    return engineer.extract_features_row(
+        rounds["multiplier"][:idx],
+        rounds["betCount"][:idx],
+        rounds["totalBet"][:idx],
+        rounds["totalWin"][:idx],
+        round_timestamp(rounds, idx),
+    )
+
+
+def streaming_features(engineer, rounds, idx):
+    """Features of round idx from IncrementalFeatureState."""
+    state = IncrementalFeatureState(engineer)
+    state.extend(rounds[:idx])
+    return state.snapshot(round_timestamp(rounds, idx))
+
+
+def round_timestamp(rounds, idx):
+    return pd.to_datetime(rounds["createdAt"][idx], format="ISO8601", utc=True)
+
+
+class ThresholdMultipliersTest(unittest.TestCase):
+    """Rounds exactly on a threshold must be counted the same on every path."""
+
+    def test_paths_agree_on_threshold_multipliers(self):
+        rng = np.random.default_rng(7)
+        multipliers = rng.choice([1.0, 1.20, 1.5, 2.0, 5.0, 10.0, 1.21, 3.37], size=300)
+        rounds = make_rounds(multipliers)
+        self.assertEqual(rounds["multiplier"].dtype, np.float32)
+
+        engineer = FeatureEngineer()
+        X, _, valid_indices = create_training_dataset(rounds)
+
+        for j in (0, len(valid_indices) // 2, len(valid_indices) - 1):
+            idx = valid_indices[j]
+            row = row_features(engineer, rounds, idx)
+            np.testing.assert_allclose(streaming_features(engineer, rounds, idx), row, rtol=1e-5, atol=1e-6)
+            np.testing.assert_allclose(X[j], row, rtol=1e-5, atol=1e-6)
+
+
+class StreamingEquivalenceTest(unittest.TestCase):
+    """The streaming state must match the row and batch feature paths."""
+
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(42)
+        # Heavy-tailed like real crash multipliers, floored at 1.0
+        multipliers = np.maximum(1.0, np.round(0.99 / rng.uniform(0.0, 1.0, size=400), 2))
+        cls.rounds = make_rounds(multipliers, seed=42)
+        cls.engineer = FeatureEngineer()
+
+    def assert_paths_agree(self, indices, batch_rows):
+        for idx, batch_row in zip(indices, batch_rows):
+            row = row_features(self.engineer, self.rounds, idx)
+            np.testing.assert_allclose(
+                streaming_features(self.engineer, self.rounds, idx), row, rtol=1e-5, atol=1e-6
+            )
+            np.testing.assert_allclose(batch_row, row, rtol=1e-5, atol=1e-6)
+
+    def test_window_eviction(self):
+        # More rounds than the largest window, so every window has evicted values
+        X, _, valid_indices = create_training_dataset(self.rounds)
+        self.assertGreater(valid_indices[0], max(WINDOW_SIZES))
+        picks = [0, 1, len(valid_indices) // 2, len(valid_indices) - 1]
+        self.assert_paths_agree([valid_indices[j] for j in picks], X[picks])
+
+    def test_warm_up(self):
+        # Fewer rounds than the largest window, so the windows are still filling
+        df = pd.DataFrame(self.rounds)
+        X, valid_indices = self.engineer.extract_features_batch(df, start_idx=10)
+        self.assertEqual(valid_indices[0], 10)
+        picks = [0, 5, 15, 45, max(WINDOW_SIZES) - 11]
+        self.assert_paths_agree([valid_indices[j] for j in picks], X[picks])
+
+    def test_fewer_than_ten_rounds(self):
+        state = IncrementalFeatureState(self.engineer)
+        state.extend(self.rounds[:9])
+        self.assertIsNone(state.snapshot(round_timestamp(self.rounds, 9)))
+
+
+class BinEdgesTest(unittest.TestCase):
+    """The service bins features exactly like KBinsDiscretizer.transform."""
+
+    def test_matches_discretizer_transform(self):
+        rng = np.random.default_rng(3)
+        n_features = len(FeatureEngineer().feature_names)
+        X = rng.lognormal(size=(2000, n_features)).astype(np.float32)
+        # Low-cardinality columns get fewer bins and values sitting on the edges
+        X[:, :6] = rng.integers(0, 24, size=(2000, 6))
+        X_train, X_test = X[:1500], X[1500:]
+
+        discretizer = training.fit_feature_discretizer(X_train)
+        expected = discretizer.transform(X_test).astype(np.uint8)
+
+        with tempfile.TemporaryDirectory() as models_dir, \
+                mock.patch.object(training, "MODELS_DIR", Path(models_dir)), \
+                mock.patch.object(inference, "MODELS_DIR", Path(models_dir)):
+            feature_binning = training.save_feature_bin_edges(discretizer)
+            service = inference.CrashMLInferenceService()
+            service._bin_edges = service._load_bin_edges(feature_binning)
+
+        for features, expected_row in zip(X_test, expected):
+            service.generate_predictions(features[np.newaxis])
+            np.testing.assert_array_equal(service._binned_buffer[0], expected_row)
+
+
+if __name__ == "__main__":
+    unittest.main()
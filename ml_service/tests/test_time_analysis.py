@@ -0,0 +1,52 @@
+"""
+Tests for backtesting.time_analysis data loading.
+"""
+
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backtesting import time_analysis
+
+
+class LoadDataTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db_path = Path(self._tmp.name) / "crash_stats.db"
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(
+            "CREATE TABLE rounds (id INTEGER PRIMARY KEY, createdAt TEXT, "
+            "multiplier REAL, betCount INTEGER, totalBet REAL, totalWin REAL)"
+        )
+        conn.executemany(
+            "INSERT INTO rounds (createdAt, multiplier, betCount, totalBet, totalWin) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [
+                ("2024-01-01T12:00:00.000Z", 1.5, 10, 100.0, 80.0),
+                ("not-a-timestamp", 2.0, 20, 200.0, 150.0),
+                ("2024-01-02T03:30:00.000Z", 3.0, 30, 300.0, 250.0),
+            ],
+        )
+        conn.commit()
+        conn.close()
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_malformed_created_at_is_dropped(self):
+        with mock.patch.object(time_analysis, "DB_PATH", self.db_path):
+            df = time_analysis.load_data()
+
+        self.assertEqual(len(df), 2)
+        self.assertEqual(df["multiplier"].tolist(), [1.5, 3.0])
+        # UTC-3: 12:00 -> 9h, 03:30 -> 0h
+        self.assertEqual(df["hour"].tolist(), [9, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+Tests for the parallel model training in training.py.
+"""
+
+import sys
+import unittest
+import weakref
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import xgboost as xgb
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import training
+
+
+class TrainModelWorkerTest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.X = rng.integers(0, 256, size=(200, 8)).astype(np.uint8)
+        self.y = rng.integers(0, 2, size=200).astype(np.int8)
+
+    def test_failure_surfaces_original_exception(self):
+        shm, spec = training._share_array(self.X)
+        views = []
+        closed_with_views = []
+        close = training.shared_memory.SharedMemory.close
+
+        def failing_train(X_train, *args, **kwargs):
+            views.append(weakref.ref(X_train))
+            raise ValueError("training failed")
+
+        def checked_close(block):
+            closed_with_views.append(any(view() is not None for view in views))
+            close(block)
+
+        try:
+            with mock.patch.object(training, "train_single_model", failing_train), \
+                    mock.patch.object(training.shared_memory.SharedMemory, "close", checked_close):
+                with self.assertRaisesRegex(ValueError, "training failed"):
+                    training._train_model_worker(spec, spec, self.y, self.y, "label_gt_2x", 1)
+        finally:
+            shm.close()
+            shm.unlink()
+
+        # The worker blocks were closed with no view of them left alive
+        self.assertGreaterEqual(len(closed_with_views), 2)
+        self.assertFalse(any(closed_with_views))
+
+    def test_parallel_failure_surfaces_original_exception(self):
+        train_data = {"label_gt_2x": self.y, "label_gt_3x": self.y[:10]}
+        val_data = {"label_gt_2x": self.y[:50], "label_gt_3x": self.y[:50]}
+
+        with self.assertRaises(xgb.core.XGBoostError):
+            training.train_models(
+                self.X, self.X[:50], train_data, val_data,
+                ["label_gt_2x", "label_gt_3x"], n_workers=2
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -12,17 +12,22 @@ IMPORTANT: The split is done temporally to prevent any data leakage.
 Training data comes first, then validation, then test.
 """
 
+import os
 import sqlite3
 import logging
 import json
+import hashlib
+import traceback
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 
 import numpy as np
-import pandas as pd
 import joblib
-from sklearn.preprocessing import StandardScaler
+from sklearn.preprocessing import KBinsDiscretizer, StandardScaler
 from sklearn.metrics import (
     roc_auc_score,
     log_loss,
@@ -35,6 +40,11 @@ from sklearn.metrics import (
 )
 from xgboost import XGBClassifier
 
+try:
+    import cupy  # Optional: keeps the training data on the GPU when XGBOOST_DEVICE is cuda
+except ImportError:
+    cupy = None
+
 from config import (
     DATABASE_PATH,
     MODELS_DIR,
@@ -44,11 +54,14 @@ from config import (
     VALIDATION_RATIO,
     TEST_RATIO,
     MIN_ROUNDS_FOR_TRAINING,
+    FEATURE_BINS,
+    TRAINING_WORKERS,
+    XGBOOST_DEVICE,
     XGBOOST_PARAMS,
     XGBOOST_PARAMS_RARE_EVENTS,
     USE_CLASS_WEIGHTS,
 )
-from features import FeatureEngineer, LabelGenerator, create_training_dataset
+from features import FeatureEngineer, LabelGenerator, create_training_dataset, round_dtype
 from bot_history_integration import (
     BotHistoryAnalyzer,
     get_bot_performance_features,
@@ -63,7 +76,7 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def load_rounds_from_sqlite(db_path: Path = DATABASE_PATH) -> pd.DataFrame:
+def load_rounds_from_sqlite(db_path: Path = DATABASE_PATH) -> np.ndarray:
     """
     Load all rounds from the SQLite database.
 
@@ -71,7 +84,7 @@ def load_rounds_from_sqlite(db_path: Path = DATABASE_PATH) -> pd.DataFrame:
         db_path: Path to the SQLite database
 
     Returns:
-        DataFrame with rounds data
+        Structured array (round_dtype) sorted by createdAt
     """
     logger.info(f"Loading rounds from {db_path}")
 
@@ -92,12 +105,17 @@ def load_rounds_from_sqlite(db_path: Path = DATABASE_PATH) -> pd.DataFrame:
         ORDER BY createdAt ASC
     """
 
-    df = pd.read_sql_query(query, conn)
+    # createdAt is sized to the longest stored value so it is never truncated
+    (created_at_length,) = conn.execute("SELECT MAX(LENGTH(createdAt)) FROM rounds").fetchone()
+
+    # Rows go straight from the cursor into typed columns, with no
+    # intermediate DataFrame or float64 copy
+    rounds = np.fromiter(conn.execute(query), dtype=round_dtype(created_at_length or 1))
     conn.close()
 
-    logger.info(f"Loaded {len(df)} rounds from database")
+    logger.info(f"Loaded {len(rounds)} rounds from database")
 
-    return df
+    return rounds
 
 
 def temporal_split(
@@ -169,6 +187,32 @@ def compute_class_weight(y: np.ndarray) -> Dict[int, float]:
     return {0: weight_negative, 1: weight_positive}
 
 
+def fit_feature_discretizer(X_train: np.ndarray, n_bins: int = FEATURE_BINS) -> KBinsDiscretizer:
+    """
+    Fit per-feature quantile bins on the training split.
+
+    XGBoost's hist method bins the features anyway; binning once up front
+    lets every model train on a uint8 matrix, 8x smaller than float64.
+    Quantile bins are unchanged by per-feature scaling, so they are fitted
+    on the raw features and no scaler is needed.
+
+    Args:
+        X_train: Training features
+        n_bins: Maximum bins per feature (at most 256 to fit in uint8)
+
+    Returns:
+        Fitted KBinsDiscretizer (ordinal encoding)
+    """
+    discretizer = KBinsDiscretizer(n_bins=n_bins, encode="ordinal", strategy="quantile")
+
+    # Low-cardinality features (hour, day, counts) get fewer bins, which is expected
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", message="Bins whose width are too small")
+        discretizer.fit(X_train)
+
+    return discretizer
+
+
 def compute_scale_pos_weight(y: np.ndarray) -> float:
     """
     Compute scale_pos_weight for XGBoost (ratio of negative to positive).
@@ -193,7 +237,8 @@ def train_single_model(
     y_train: np.ndarray,
     X_val: np.ndarray,
     y_val: np.ndarray,
-    label_name: str
+    label_name: str,
+    n_jobs: Optional[int] = None
 ) -> XGBClassifier:
     """
     Train a single XGBoost classifier.
@@ -204,6 +249,7 @@ def train_single_model(
         X_val: Validation features
         y_val: Validation labels
         label_name: Name of the label being predicted
+        n_jobs: XGBoost threads (default: all cores)
 
     Returns:
         Trained XGBClassifier
@@ -225,21 +271,33 @@ def train_single_model(
         params = XGBOOST_PARAMS.copy()
 
     params["scale_pos_weight"] = scale_pos_weight
+    if n_jobs is not None:
+        params["n_jobs"] = n_jobs
 
     # Create model with configured parameters (early_stopping_rounds is in constructor)
     model = XGBClassifier(**params)
 
+    # On a GPU, move the features there once so fit and the predictions
+    # below do not copy them from host memory each time
+    on_gpu = cupy is not None and str(params.get("device", "cpu")).startswith("cuda")
+    if on_gpu:
+        X_fit, X_eval = cupy.asarray(X_train), cupy.asarray(X_val)
+    else:
+        X_fit, X_eval = X_train, X_val
+
     # Train with eval set for early stopping
     model.fit(
-        X_train,
+        X_fit,
         y_train,
-        eval_set=[(X_val, y_val)],
+        eval_set=[(X_eval, y_val)],
         verbose=False
     )
 
     # Log training results
-    train_pred = model.predict_proba(X_train)[:, 1]
-    val_pred = model.predict_proba(X_val)[:, 1]
+    train_pred = model.predict_proba(X_fit)[:, 1]
+    val_pred = model.predict_proba(X_eval)[:, 1]
+    if on_gpu:
+        train_pred, val_pred = cupy.asnumpy(train_pred), cupy.asnumpy(val_pred)
 
     train_auc = roc_auc_score(y_train, train_pred) if len(np.unique(y_train)) > 1 else 0
     val_auc = roc_auc_score(y_val, val_pred) if len(np.unique(y_val)) > 1 else 0
@@ -253,6 +311,111 @@ def train_single_model(
     return model
 
 
+def _share_array(array: np.ndarray) -> Tuple[shared_memory.SharedMemory, Tuple]:
+    """Copy an array into a new shared memory block; returns the block and its spec."""
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+    return shm, (shm.name, array.shape, array.dtype.str)
+
+
+def _train_model_worker(
+    X_train_spec: Tuple,
+    X_val_spec: Tuple,
+    y_train: np.ndarray,
+    y_val: np.ndarray,
+    label_name: str,
+    n_jobs: int
+) -> XGBClassifier:
+    """Train one model in a worker process on the shared feature matrices."""
+    blocks = [shared_memory.SharedMemory(name=spec[0]) for spec in (X_train_spec, X_val_spec)]
+    X_train = X_val = None
+    try:
+        X_train, X_val = (
+            np.ndarray(spec[1], dtype=spec[2], buffer=shm.buf)
+            for spec, shm in zip((X_train_spec, X_val_spec), blocks)
+        )
+        return train_single_model(X_train, y_train, X_val, y_val, label_name, n_jobs=n_jobs)
+    except BaseException as e:
+        # The frames of the traceback still reference the views; clear them
+        # so closing the blocks cannot fail and mask this exception
+        error = e
+        while error is not None:
+            traceback.clear_frames(error.__traceback__)
+            error = error.__cause__ or error.__context__
+        raise
+    finally:
+        # The views must be gone before their buffers are closed
+        X_train = X_val = None
+        for shm in blocks:
+            shm.close()
+
+
+def train_models(
+    X_train: np.ndarray,
+    X_val: np.ndarray,
+    train_data: Dict,
+    val_data: Dict,
+    label_names: List[str],
+    n_workers: int = TRAINING_WORKERS
+) -> Dict[str, XGBClassifier]:
+    """
+    Train one model per label, in parallel when more than one worker is allowed.
+
+    The models are independent, so each one is fitted in its own process.
+    The scaled feature matrices are placed in shared memory once instead of
+    being pickled to every worker, and the cores are split between the
+    workers to avoid oversubscription.
+
+    Args:
+        X_train: Scaled training features
+        X_val: Scaled validation features
+        train_data: Training split (label arrays by name)
+        val_data: Validation split (label arrays by name)
+        label_names: Labels to train models for
+        n_workers: Maximum number of worker processes
+
+    Returns:
+        Dictionary mapping label names to trained models
+    """
+    n_workers = min(n_workers, len(label_names))
+
+    # A single GPU is best used by one model at a time
+    if XGBOOST_DEVICE.startswith("cuda"):
+        n_workers = 1
+
+    if n_workers <= 1:
+        return {
+            label_name: train_single_model(
+                X_train, train_data[label_name],
+                X_val, val_data[label_name],
+                label_name
+            )
+            for label_name in label_names
+        }
+
+    logger.info(f"Training {len(label_names)} models with {n_workers} worker processes")
+    n_jobs = max(1, (os.cpu_count() or 1) // n_workers)
+
+    train_shm, X_train_spec = _share_array(X_train)
+    val_shm, X_val_spec = _share_array(X_val)
+    try:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            futures = {
+                label_name: executor.submit(
+                    _train_model_worker,
+                    X_train_spec, X_val_spec,
+                    train_data[label_name], val_data[label_name],
+                    label_name, n_jobs
+                )
+                for label_name in label_names
+            }
+            return {label_name: future.result() for label_name, future in futures.items()}
+    finally:
+        for shm in (train_shm, val_shm):
+            shm.close()
+            shm.unlink()
+
+
 def evaluate_model(
     model: XGBClassifier,
     X: np.ndarray,
@@ -342,8 +505,36 @@ def save_model(model, scaler: StandardScaler, model_name: str) -> Path:
     return model_path
 
 
+def save_feature_bin_edges(discretizer: KBinsDiscretizer) -> Dict:
+    """
+    Save the fitted bin edges for the inference service.
+
+    Only the edges are persisted: the service applies them itself instead
+    of calling KBinsDiscretizer.transform on every prediction.
+
+    Args:
+        discretizer: Fitted KBinsDiscretizer
+
+    Returns:
+        Binning description to record in the training metadata
+    """
+    edges_path = MODELS_DIR / MODEL_FILES["bin_edges"]
+    joblib.dump(list(discretizer.bin_edges_), edges_path)
+    logger.info(f"Saved feature bin edges to {edges_path}")
+
+    return {
+        "file": MODEL_FILES["bin_edges"],
+        "strategy": discretizer.strategy,
+        "n_bins": int(discretizer.n_bins),
+        "sha256": hashlib.sha256(edges_path.read_bytes()).hexdigest(),
+    }
+
+
 def save_training_metadata(
-    metrics: Dict, feature_names: list, bot_analysis: Optional[Dict] = None
+    metrics: Dict,
+    feature_names: list,
+    bot_analysis: Optional[Dict] = None,
+    feature_binning: Optional[Dict] = None,
 ) -> None:
     """
     Save training metadata and metrics to a JSON file.
@@ -352,12 +543,15 @@ def save_training_metadata(
         metrics: Dictionary of all model metrics
         feature_names: List of feature names
         bot_analysis: Optional bot history analysis data
+        feature_binning: Binning the models were trained with (None if the
+            models take scaled features)
     """
     metadata = {
         "model_version": MODEL_VERSION,
         "trained_at": datetime.now().isoformat(),
         "feature_names": feature_names,
         "metrics": metrics,
+        "feature_binning": feature_binning,
     }
 
     # Include bot analysis if available
@@ -432,18 +626,18 @@ def run_training_pipeline(db_path: Path = DATABASE_PATH) -> Dict:
         logger.warning(f"  Could not analyze bot history: {e}")
 
     # 1. Load data
-    df = load_rounds_from_sqlite(db_path)
+    rounds = load_rounds_from_sqlite(db_path)
 
-    if len(df) < MIN_ROUNDS_FOR_TRAINING:
+    if len(rounds) < MIN_ROUNDS_FOR_TRAINING:
         raise ValueError(
             f"Insufficient data for training. "
             f"Need at least {MIN_ROUNDS_FOR_TRAINING} rounds, "
-            f"but only have {len(df)}"
+            f"but only have {len(rounds)}"
         )
 
     # 2. Create training dataset
     logger.info("\nCreating training dataset...")
-    X, labels, valid_indices = create_training_dataset(df)
+    X, labels, valid_indices = create_training_dataset(rounds)
 
     if len(X) == 0:
         raise ValueError("No valid samples created from data")
@@ -455,12 +649,12 @@ def run_training_pipeline(db_path: Path = DATABASE_PATH) -> Dict:
     logger.info("\nSplitting data temporally...")
     train_data, val_data, test_data = temporal_split(X, labels)
 
-    # 4. Scale features
-    logger.info("\nScaling features...")
-    scaler = StandardScaler()
-    X_train_scaled = scaler.fit_transform(train_data["X"])
-    X_val_scaled = scaler.transform(val_data["X"])
-    X_test_scaled = scaler.transform(test_data["X"])
+    # 4. Quantize features into uint8 bins (fitted on the training split only)
+    logger.info("\nQuantizing features...")
+    discretizer = fit_feature_discretizer(train_data["X"])
+    X_train_binned = discretizer.transform(train_data["X"]).astype(np.uint8)
+    X_val_binned = discretizer.transform(val_data["X"]).astype(np.uint8)
+    X_test_binned = discretizer.transform(test_data["X"]).astype(np.uint8)
 
     # 5. Train models for each target
     models = {}
@@ -491,30 +685,29 @@ def run_training_pipeline(db_path: Path = DATABASE_PATH) -> Dict:
         "label_high_loss_streak": "high_loss_streak",
     }
 
+    # Skip labels with a single class in the training data
+    trainable_labels = []
     for label_name in target_names:
-        logger.info(f"\n{'=' * 40}")
-        logger.info(f"Training model for: {label_name}")
-        logger.info("=" * 40)
-
-        y_train = train_data[label_name]
-        y_val = val_data[label_name]
-        y_test = test_data[label_name]
-
-        # Skip if all same class
-        if len(np.unique(y_train)) < 2:
+        if len(np.unique(train_data[label_name])) < 2:
             logger.warning(f"Skipping {label_name}: only one class in training data")
             continue
+        trainable_labels.append(label_name)
 
-        # Train model
-        model = train_single_model(
-            X_train_scaled, y_train,
-            X_val_scaled, y_val,
-            label_name
-        )
+    # Train models (independent per label, so they can run in parallel)
+    trained = train_models(
+        X_train_binned, X_val_binned, train_data, val_data, trainable_labels
+    )
+
+    for label_name in trainable_labels:
+        logger.info(f"\n{'=' * 40}")
+        logger.info(f"Evaluating model for: {label_name}")
+        logger.info("=" * 40)
+
+        model = trained[label_name]
 
         # Evaluate on test set
         test_metrics = evaluate_model(
-            model, X_test_scaled, y_test, label_name, "Test"
+            model, X_test_binned, test_data[label_name], label_name, "Test"
         )
 
         # Store model and metrics
@@ -525,13 +718,10 @@ def run_training_pipeline(db_path: Path = DATABASE_PATH) -> Dict:
         # Save model
         save_model(model, None, model_key)
 
-    # Save scaler (only once)
-    scaler_path = MODELS_DIR / MODEL_FILES["scaler"]
-    joblib.dump(scaler, scaler_path)
-    logger.info(f"\nSaved feature scaler to {scaler_path}")
+    feature_binning = save_feature_bin_edges(discretizer)
 
     # 6. Save metadata (including bot analysis if available)
-    save_training_metadata(all_metrics, feature_names, bot_analysis)
+    save_training_metadata(all_metrics, feature_names, bot_analysis, feature_binning)
 
     # Summary
     logger.info("\n" + "=" * 60)
@@ -13,6 +13,7 @@
 
 import { firefox } from 'playwright';
 import { insertRound } from '../database.js';
+import { publishNewRound } from './redisSubscriber.js';
 import { broadcastRound, broadcastSignal } from './websocket.js';
 import * as sequenceIndicator from './sequenceIndicator.js';
 import { getPlatformConfig } from './platforms.js';
@@ -234,6 +235,7 @@ export class Bet365CDPWatcher {
     try {
       const id = insertRound(round, 'bet365');
       round.id = id;
+      publishNewRound(id);
       round.platform = 'bet365';
 
       // Log colorido para crashes 1x
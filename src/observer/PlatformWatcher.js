@@ -8,6 +8,7 @@ import { chromium, webkit, firefox } from 'playwright';
 import path from 'path';
 import { fileURLToPath } from 'url';
 import { insertRound } from '../database.js';
+import { publishNewRound } from './redisSubscriber.js';
 import { broadcastRound, broadcastSignal } from './websocket.js';
 import * as sequenceIndicator from './sequenceIndicator.js';
 import { getPlatformConfig } from './platforms.js';
@@ -503,6 +504,7 @@ export class PlatformWatcher {
     try {
       const id = insertRound(round, this.platformId);
       round.id = id;
+      publishNewRound(id);
       round.platform = this.platformId;
 
       // Special highlighting for 1x crashes
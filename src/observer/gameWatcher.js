@@ -2,6 +2,7 @@ import { chromium } from 'playwright';
 import path from 'path';
 import { fileURLToPath } from 'url';
 import { insertRound } from '../database.js';
+import { publishNewRound } from './redisSubscriber.js';
 import * as liveBetting from '../liveBetting.js';
 import { broadcastRound, broadcastBettingPhase, broadcastSignal } from './websocket.js';
 import * as wsCapture from './wsCapture.js';
@@ -615,6 +616,7 @@ export async function startGameWatcher() {
     try {
       const id = insertRound(round);
       round.id = id;
+      publishNewRound(id);
 
       // Special highlighting for 1x crashes (very important for ML training)
       if (multiplier <= 1.05) {
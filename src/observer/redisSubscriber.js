@@ -3,6 +3,8 @@
  *
  * This module connects to Redis and subscribes to the ml_predictions channel.
  * When predictions are received, they are broadcast to all WebSocket clients.
+ * It also announces each inserted round on the new_rounds channel, so the ML
+ * service can predict as soon as a round is saved instead of polling SQLite.
  */
 
 import { createClient } from 'redis';
@@ -17,8 +19,10 @@ const REDIS_CONFIG = {
 };
 
 const REDIS_CHANNEL = 'ml_predictions';
+const REDIS_CHANNEL_NEW_ROUNDS = 'new_rounds';
 
 let subscriber = null;
+let publisher = null;
 let isConnected = false;
 let lastPrediction = null;
 
@@ -63,6 +67,14 @@ export async function initRedisSubscriber() {
     });
 
     console.log(`[Redis] Subscribed to channel: ${REDIS_CHANNEL}`);
+
+    // A connection in subscriber mode cannot publish, so use a second one
+    publisher = subscriber.duplicate();
+    publisher.on('error', (err) => {
+      console.error('[Redis] Publisher error:', err.message);
+    });
+    await publisher.connect();
+
     return true;
 
   } catch (error) {
@@ -94,6 +106,19 @@ function handlePrediction(message) {
   }
 }
 
+/**
+ * Announce a newly inserted round to the ML service
+ */
+export function publishNewRound(roundId) {
+  if (!publisher || !publisher.isReady) {
+    return;
+  }
+
+  publisher.publish(REDIS_CHANNEL_NEW_ROUNDS, String(roundId)).catch((error) => {
+    console.error('[Redis] Failed to publish new round:', error.message);
+  });
+}
+
 /**
  * Get the last prediction received
  */
@@ -120,10 +145,16 @@ export async function closeRedisSubscriber() {
     isConnected = false;
     console.log('[Redis] Connection closed');
   }
+
+  if (publisher) {
+    await publisher.quit();
+    publisher = null;
+  }
 }
 
 export default {
   initRedisSubscriber,
+  publishNewRound,
   getLastPrediction,
   isRedisConnected,
   closeRedisSubscriber,
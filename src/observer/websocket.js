@@ -1,6 +1,7 @@
 import { WebSocketServer } from 'ws';
 import { WS_MESSAGE_TYPES } from '../shared/protocol.js';
 import { insertRound, syncHistoryMultipliers } from '../database.js';
+import { publishNewRound } from './redisSubscriber.js';
 import * as sequenceIndicator from './sequenceIndicator.js';
 
 let wss = null;
@@ -180,6 +181,7 @@ function handleIncomingMessage(message, ws) {
     try {
       const id = insertRound(round, 'bet365');
       round.id = id;
+      publishNewRound(id);
       round.platform = 'bet365';
 
       // Log colorido para crashes 1x